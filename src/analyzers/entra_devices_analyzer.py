@@ -7,6 +7,7 @@ from difflib import SequenceMatcher
 import unicodedata
 from analyzers.base_analyzer import BaseAnalyzer
 from utils.scoring import CheckResult
+from utils.console import PROMPT_LOCK
 
 logger = logging.getLogger(__name__)
 
@@ -231,31 +232,32 @@ class EntraDevicesAnalyzer(BaseAnalyzer):
         Returns:
             Report month in YYYY-MM format
         """
-        print("\n" + "="*60)
-        print("ENTRA DEVICES REPORT - MONAT EINGABE")
-        print("="*60)
-        if self.filename:
-            print(f"\nDatei: {self.filename}")
-        print("\nBitte geben Sie den Berichtszeitraum für diesen Entra Devices Report ein.")
-        print("Format: YYYY-MM (z.B. 2024-10 für Oktober 2024)")
-        print()
-
-        while True:
-            user_input = input("Berichtszeitraum (YYYY-MM): ").strip()
-
-            # Validate format
-            if re.match(r'^\d{4}-\d{2}$', user_input):
-                # Validate month is 01-12
-                year, month = user_input.split('-')
-                if 1 <= int(month) <= 12:
-                    logger.info(f"User entered report month: {user_input}")
-                    print(f"\nBerichtszeitraum gesetzt: {user_input}")
-                    print("="*60 + "\n")
-                    return user_input
+        with PROMPT_LOCK:
+            print("\n" + "="*60)
+            print("ENTRA DEVICES REPORT - MONAT EINGABE")
+            print("="*60)
+            if self.filename:
+                print(f"\nDatei: {self.filename}")
+            print("\nBitte geben Sie den Berichtszeitraum für diesen Entra Devices Report ein.")
+            print("Format: YYYY-MM (z.B. 2024-10 für Oktober 2024)")
+            print()
+
+            while True:
+                user_input = input("Berichtszeitraum (YYYY-MM): ").strip()
+
+                # Validate format
+                if re.match(r'^\d{4}-\d{2}$', user_input):
+                    # Validate month is 01-12
+                    year, month = user_input.split('-')
+                    if 1 <= int(month) <= 12:
+                        logger.info(f"User entered report month: {user_input}")
+                        print(f"\nBerichtszeitraum gesetzt: {user_input}")
+                        print("="*60 + "\n")
+                        return user_input
+                    else:
+                        print(f"Fehler: Monat '{month}' ist ungültig. Bitte einen Monat zwischen 01 und 12 eingeben.")
                 else:
-                    print(f"Fehler: Monat '{month}' ist ungültig. Bitte einen Monat zwischen 01 und 12 eingeben.")
-            else:
-                print(f"Fehler: Ungültiges Format '{user_input}'. Bitte Format YYYY-MM verwenden (z.B. 2024-10)")
+                    print(f"Fehler: Ungültiges Format '{user_input}'. Bitte Format YYYY-MM verwenden (z.B. 2024-10)")
 
     def _calculate_inactive_devices(self, df: pd.DataFrame, report_date: datetime) -> pd.DataFrame:
         """
@@ -1,10 +1,11 @@
-from core.llm_handler import OllamaHandler, LLMResponse
+from core.llm_handler import OllamaHandler, CachedLLMHandler, LLMResponse
 from core.report_detector import ReportDetector, DetectionResult
 from core.report_analyzer import ReportAnalyzer, AnalysisResult
 from core.result_handler import ResultHandler
 
 __all__ = [
     'OllamaHandler',
+    'CachedLLMHandler',
     'LLMResponse',
     'ReportDetector',
     'DetectionResult',
@@ -1,17 +1,29 @@
+import asyncio
 import logging
 import json
 import re
+import threading
 import time
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Union
+from dataclasses import dataclass, asdict
+import httpx
 import ollama
-from ollama import Client
+from ollama import Client, AsyncClient
 from langchain_community.llms import Ollama as LangchainOllama
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
+from utils.llm_cache import LLMCache
+
 logger = logging.getLogger(__name__)
 
+# Connection pool of the Ollama HTTP clients; keep-alive connections are
+# reused across requests and worker threads
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
+# Context window requested for batch classification prompts (several documents)
+BATCH_CONTEXT_TOKENS = 8192
+
 
 @dataclass
 class LLMResponse:
@@ -45,9 +57,19 @@ class OllamaHandler:
         self.temperature = temperature
         self.max_retries = max_retries
         
+        # Async clients with their event loops, one per thread (see _get_async_client);
+        # the loops and client transports are kept for close()
+        self._async_state = threading.local()
+        self._async_clients: List[Tuple[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]] = []
+        self._async_lock = threading.Lock()
+        
+        # The HTTP transports (connection pools) are created here and passed to
+        # the ollama clients, so close() can shut down the connections it owns
+        self._transport = httpx.HTTPTransport(limits=HTTP_POOL_LIMITS)
+        
         # Initialize Ollama client
         try:
-            self.client = Client(host=base_url)
+            self.client = Client(host=base_url, transport=self._transport)
             self._test_connection()
         except Exception as e:
             logger.error(f"Failed to initialize Ollama client: {e}")
@@ -138,12 +160,7 @@ class OllamaHandler:
         start_time = time.time()
         
         try:
-            # Format prompt
-            prompt = prompt_template.format(content=content[:10000])  # Limit content size
-            
-            if options:
-                prompt += f"\n\nValid options: {', '.join(options)}"
-                prompt += "\nRespond with only one of the valid options."
+            prompt = self._build_classification_prompt(content, prompt_template, options)
             
             # Make request with retries
             for attempt in range(self.max_retries):
@@ -151,31 +168,11 @@ class OllamaHandler:
                     response = self.client.generate(
                         model=self.model,
                         prompt=prompt,
-                        options={
-                            'temperature': self.temperature,
-                            'top_p': 0.9,
-                            'num_predict': 100  # Limit response length for classification
-                        }
+                        options=self._classification_options()
                     )
                     
                     if response and 'response' in response:
-                        content = response['response'].strip()
-                        
-                        # Extract confidence if present
-                        confidence = self._extract_confidence(content)
-                        
-                        # Validate against options if provided
-                        if options:
-                            content = self._validate_classification(content, options)
-                        
-                        duration_ms = (time.time() - start_time) * 1000
-                        
-                        return LLMResponse(
-                            content=content,
-                            confidence=confidence,
-                            model=self.model,
-                            duration_ms=duration_ms
-                        )
+                        return self._build_classification_response(response, options, start_time)
                     
                 except Exception as e:
                     if attempt < self.max_retries - 1:
@@ -191,6 +188,232 @@ class OllamaHandler:
                 error=str(e)
             )
     
+    async def aclassify(self, content: str, prompt_template: str,
+                        options: Optional[List[str]] = None,
+                        client: Optional[AsyncClient] = None) -> LLMResponse:
+        """
+        Classify content using LLM without blocking the event loop.
+        
+        Args:
+            content: Content to classify
+            prompt_template: Prompt template with {content} placeholder
+            options: Optional list of valid classification options
+            client: Optional AsyncClient to share between concurrent requests
+            
+        Returns:
+            LLM response with classification
+        """
+        # A client created for this call only is closed again at the end
+        own_transport = None
+        if client is None:
+            own_transport = httpx.AsyncHTTPTransport(limits=HTTP_POOL_LIMITS)
+            client = AsyncClient(host=self.base_url, transport=own_transport)
+        start_time = time.time()
+        
+        try:
+            prompt = self._build_classification_prompt(content, prompt_template, options)
+            
+            # Make request with retries
+            for attempt in range(self.max_retries):
+                try:
+                    response = await client.generate(
+                        model=self.model,
+                        prompt=prompt,
+                        options=self._classification_options()
+                    )
+                    
+                    if response and 'response' in response:
+                        return self._build_classification_response(response, options, start_time)
+                    
+                except Exception as e:
+                    if attempt < self.max_retries - 1:
+                        logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying...")
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                    else:
+                        raise
+            
+        except Exception as e:
+            logger.error(f"Classification failed: {e}")
+            return LLMResponse(
+                content="",
+                error=str(e)
+            )
+        
+        finally:
+            if own_transport is not None:
+                await own_transport.aclose()
+    
+    def classify_many(self, content: str, prompt_templates: List[str],
+                      options: Optional[List[str]] = None) -> List[LLMResponse]:
+        """
+        Classify the same content against several prompts concurrently.
+        
+        Args:
+            content: Content to classify
+            prompt_templates: Prompt templates with {content} placeholder
+            options: Optional list of valid classification options
+            
+        Returns:
+            LLM responses in the order of prompt_templates
+        """
+        if not self.client:
+            return [LLMResponse(content="", error="Ollama client not initialized")
+                    for _ in prompt_templates]
+        
+        loop, client = self._get_async_client()
+        
+        async def classify_all() -> List[LLMResponse]:
+            return await asyncio.gather(*(
+                self.aclassify(content, template, options, client=client)
+                for template in prompt_templates
+            ))
+        
+        return loop.run_until_complete(classify_all())
+    
+    def _get_async_client(self) -> Tuple[asyncio.AbstractEventLoop, AsyncClient]:
+        """
+        Get the event loop and AsyncClient of the current thread.
+        
+        Both are kept for the lifetime of the handler, so the keep-alive
+        connections of the client are reused across classify_many calls
+        (httpx connections are bound to the loop that opened them).
+        
+        Returns:
+            Tuple of (event loop, AsyncClient)
+        """
+        if not hasattr(self._async_state, "client"):
+            loop = asyncio.new_event_loop()
+            transport = httpx.AsyncHTTPTransport(limits=HTTP_POOL_LIMITS)
+            client = AsyncClient(host=self.base_url, transport=transport)
+            self._async_state.loop = loop
+            self._async_state.client = client
+            
+            with self._async_lock:
+                self._async_clients.append((loop, transport))
+        
+        return self._async_state.loop, self._async_state.client
+    
+    def classify_batch(self, contents: List[str], prompt_template: str,
+                       options: List[str]) -> Optional[List[LLMResponse]]:
+        """
+        Classify several documents with one prompt in a single request.
+        
+        The documents are inserted into the prompt as numbered sections and the
+        model is asked for a JSON array with one answer per document.
+        
+        Args:
+            contents: Contents of the documents to classify
+            prompt_template: Prompt template with {content} placeholder
+            options: Valid classification options
+            
+        Returns:
+            LLM responses in the order of contents, or None if the request
+            failed or the answer was not a valid array (classify per document then)
+        """
+        if not self.client or not contents:
+            return None
+        
+        start_time = time.time()
+        count = len(contents)
+        documents = "\n\n".join(
+            f"### DOC {i}\n{content}" for i, content in enumerate(contents, 1)
+        )
+        prompt = prompt_template.format(content=documents)
+        prompt += (f"\n\nThe content above consists of {count} documents "
+                   f"(DOC 1 to DOC {count}); classify each of them separately.")
+        prompt += (f"\nReturn a JSON array of exactly {count} answers in document order, "
+                   f"each one of: {', '.join(options)}.")
+        
+        # Constrain the output to an array with one valid option per document
+        schema = {
+            "type": "array",
+            "items": {"type": "string", "enum": list(options)},
+            "minItems": count,
+            "maxItems": count
+        }
+        
+        for attempt in range(self.max_retries):
+            try:
+                response = self.client.generate(
+                    model=self.model,
+                    prompt=prompt,
+                    format=schema,
+                    options={
+                        **self._classification_options(),
+                        'num_predict': 20 * count,
+                        'num_ctx': BATCH_CONTEXT_TOKENS
+                    }
+                )
+                break
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying...")
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    logger.error(f"Batch classification failed: {e}")
+                    return None
+        
+        try:
+            answers = json.loads(response['response'])
+        except (json.JSONDecodeError, TypeError):
+            answers = None
+        
+        if not isinstance(answers, list) or len(answers) != count:
+            logger.warning(f"Batch classification returned no valid array for {count} documents")
+            return None
+        
+        duration_ms = (time.time() - start_time) * 1000
+        
+        return [
+            LLMResponse(
+                content=self._validate_classification(str(answer), options),
+                confidence=self._extract_confidence(str(answer)),
+                model=self.model,
+                duration_ms=duration_ms
+            )
+            for answer in answers
+        ]
+    
+    def _build_classification_prompt(self, content: str, prompt_template: str,
+                                     options: Optional[List[str]] = None) -> str:
+        """Format a classification prompt, appending the valid options."""
+        prompt = prompt_template.format(content=content[:10000])  # Limit content size
+        
+        if options:
+            prompt += f"\n\nValid options: {', '.join(options)}"
+            prompt += "\nRespond with only one of the valid options."
+        
+        return prompt
+    
+    def _classification_options(self) -> Dict[str, Any]:
+        """Generation options used for classification requests."""
+        return {
+            'temperature': self.temperature,
+            'top_p': 0.9,
+            'num_predict': 100  # Limit response length for classification
+        }
+    
+    def _build_classification_response(self, response: Any, options: Optional[List[str]],
+                                       start_time: float) -> LLMResponse:
+        """Turn a raw generate response into a classification LLMResponse."""
+        content = response['response'].strip()
+        
+        # Extract confidence if present
+        confidence = self._extract_confidence(content)
+        
+        # Validate against options if provided
+        if options:
+            content = self._validate_classification(content, options)
+        
+        duration_ms = (time.time() - start_time) * 1000
+        
+        return LLMResponse(
+            content=content,
+            confidence=confidence,
+            model=self.model,
+            duration_ms=duration_ms
+        )
+    
     def analyze(self, content: str, prompt_template: str, 
                extract_json: bool = True) -> LLMResponse:
         """
@@ -531,4 +754,127 @@ class OllamaHandler:
         Returns:
             True if service is available
         """
-        return self.client is not None and self._test_connection()
\ No newline at end of file
+        return self.client is not None and self._test_connection()
+    
+    def close(self) -> None:
+        """Close the HTTP connections of the sync and async clients."""
+        with self._async_lock:
+            async_clients, self._async_clients = self._async_clients, []
+        
+        for loop, transport in async_clients:
+            try:
+                loop.run_until_complete(transport.aclose())
+            except Exception as e:
+                logger.debug(f"Failed to close async Ollama client: {e}")
+            finally:
+                loop.close()
+        
+        self._async_state = threading.local()
+        
+        self._transport.close()
+    
+    def warm_up(self) -> bool:
+        """
+        Load the model into memory ahead of the first real request.
+        
+        Ollama loads a model on its first request; an empty generate request
+        only loads it, so the load time is kept out of the first classification.
+        
+        Returns:
+            True if the model was loaded
+        """
+        if self.client is None:
+            return False
+        
+        try:
+            start_time = time.time()
+            self.client.generate(model=self.model, prompt="")
+            logger.info(f"Model {self.model} loaded in {time.time() - start_time:.1f}s")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+            return False
+
+
+class CachedLLMHandler:
+    """OllamaHandler wrapper that serves repeated requests from a persistent cache."""
+    
+    def __init__(self, handler: OllamaHandler, cache: LLMCache):
+        """
+        Initialize CachedLLMHandler.
+        
+        Args:
+            handler: Handler used for cache misses
+            cache: Cache for successful responses
+        """
+        self.handler = handler
+        self.cache = cache
+    
+    def __getattr__(self, name: str) -> Any:
+        # Everything that is not cached is delegated to the wrapped handler
+        return getattr(self.handler, name)
+    
+    def classify(self, content: str, prompt_template: str,
+                options: Optional[List[str]] = None) -> LLMResponse:
+        """Classify content, using the cached response for repeated requests."""
+        key = self._make_key('classify', prompt_template, content, options)
+        response = self._load(key)
+        
+        if response is None:
+            response = self.handler.classify(content, prompt_template, options)
+            self._store(key, response)
+        
+        return response
+    
+    def classify_many(self, content: str, prompt_templates: List[str],
+                      options: Optional[List[str]] = None) -> List[LLMResponse]:
+        """Classify content against several prompts, only sending uncached ones."""
+        keys = [self._make_key('classify', template, content, options)
+                for template in prompt_templates]
+        responses = [self._load(key) for key in keys]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        
+        if missing:
+            fresh = self.handler.classify_many(
+                content, [prompt_templates[i] for i in missing], options
+            )
+            for i, response in zip(missing, fresh):
+                self._store(keys[i], response)
+                responses[i] = response
+        
+        return responses
+    
+    def analyze(self, content: str, prompt_template: str,
+               extract_json: bool = True) -> LLMResponse:
+        """Analyze content, using the cached response for repeated requests."""
+        key = self._make_key('analyze', prompt_template, content, extract_json)
+        response = self._load(key)
+        
+        if response is None:
+            response = self.handler.analyze(content, prompt_template, extract_json)
+            self._store(key, response)
+        
+        return response
+    
+    def _make_key(self, method: str, prompt_template: str, content: str, extra: Any) -> str:
+        """Build the cache key; model and temperature are part of it."""
+        return self.cache.make_key(
+            method, self.handler.model, self.handler.temperature,
+            prompt_template, content, extra
+        )
+    
+    def _load(self, key: str) -> Optional[LLMResponse]:
+        """Load a cached response."""
+        data = self.cache.get(key)
+        
+        if data is None:
+            return None
+        
+        logger.debug(f"LLM cache hit: {key[:12]}")
+        return LLMResponse(**data)
+    
+    def _store(self, key: str, response: LLMResponse) -> None:
+        """Cache a response unless the request failed."""
+        if response is not None and not response.error:
+            self.cache.set(key, asdict(response))
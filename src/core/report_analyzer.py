@@ -6,7 +6,7 @@ from dataclasses import dataclass
 import pandas as pd
 
 from utils import RiskScorer, CheckResult, ScoreResult
-from parsers import PDFParser, ExcelParser, CSVParser, HTMLParser
+from parsers import ParserMap
 from core.llm_handler import OllamaHandler
 from core.report_detector import DetectionResult
 from analyzers import VeeamBackupAnalyzer, KeeepitBackupAnalyzer, EntraDevicesAnalyzer
@@ -42,14 +42,7 @@ class ReportAnalyzer:
         self.llm_handler = llm_handler
 
         # Parser mapping
-        self.parsers = {
-            'pdf': PDFParser(),
-            'xlsx': ExcelParser(),
-            'xls': ExcelParser(),
-            'csv': CSVParser(),
-            'html': HTMLParser(),
-            'htm': HTMLParser()
-        }
+        self.parsers = ParserMap()
 
         # Report-specific analyzers
         self.analyzers = {
@@ -574,7 +567,7 @@ class ReportAnalyzer:
             return None
         
         parser = self.parsers[file_format]
-        text_content = parser.extract_text(file_path, max_chars=15000)
+        text_content = parser.cached_extract_text(file_path, max_chars=15000)
         
         if not text_content:
             return None
@@ -6,11 +6,15 @@ from dataclasses import dataclass
 import pandas as pd
 
 from utils import ConfigLoader
-from parsers import PDFParser, ExcelParser, CSVParser, HTMLParser
-from core.llm_handler import OllamaHandler
+from utils.console import PROMPT_LOCK
+from parsers import ParserMap
+from core.llm_handler import OllamaHandler, LLMResponse
 
 logger = logging.getLogger(__name__)
 
+# Text per file in batched LLM classification (several files share one prompt)
+LLM_BATCH_TEXT_CHARS = 1500
+
 
 @dataclass
 class DetectionResult:
@@ -39,14 +43,10 @@ class ReportDetector:
         self.report_configs = config_loader.load_all_report_configs()
         
         # Parser mapping
-        self.parsers = {
-            'pdf': PDFParser(),
-            'xlsx': ExcelParser(),
-            'xls': ExcelParser(),
-            'csv': CSVParser(),
-            'html': HTMLParser(),
-            'htm': HTMLParser()
-        }
+        self.parsers = ParserMap()
+        
+        # Lower-cased content identifiers, prepared once for all files
+        self.content_identifiers = self._prepare_content_identifiers()
         
         logger.info(f"Loaded {len(self.report_configs)} report configurations")
     
@@ -82,7 +82,8 @@ class ReportDetector:
                 return result
         
         # Stage 4: Manual selection (user interaction)
-        result = self._manual_selection(file_path)
+        with PROMPT_LOCK:
+            result = self._manual_selection(file_path)
         if result:
             logger.info(f"Detected via manual selection: {result.report_type}")
             return result
@@ -90,6 +91,64 @@ class ReportDetector:
         logger.warning(f"Could not detect report type for: {file_path.name}")
         return None
     
+    def detect_batch(self, files: List[Path], batch_size: int = 10) -> List[Optional[DetectionResult]]:
+        """
+        Detect report types of several files, classifying them with the LLM in batches.
+        
+        Filename and content matching run per file as in detect(). Files that
+        remain undetected are classified together: one LLM request per report
+        type covers up to batch_size files instead of one request per file.
+        
+        Args:
+            files: Paths of the files to detect
+            batch_size: Maximum number of files per LLM request
+            
+        Returns:
+            Detection results in the order of files (None if detection failed)
+        """
+        results: Dict[Path, DetectionResult] = {}
+        pending = []
+        
+        for file_path in files:
+            logger.info(f"Starting detection for: {file_path.name}")
+            
+            # Stage 1 and 2: Filename and content matching
+            result = self._match_filename(file_path)
+            if result:
+                logger.info(f"Detected via filename: {result.report_type}")
+            else:
+                result = self._match_content(file_path)
+                if result:
+                    logger.info(f"Detected via content: {result.report_type}")
+            
+            if result:
+                results[file_path] = result
+            else:
+                pending.append(file_path)
+        
+        # Stage 3: Batched LLM classification
+        if pending and self.llm_handler and self.llm_handler.is_available():
+            for start in range(0, len(pending), batch_size):
+                for file_path, result in self._classify_batch_with_llm(
+                        pending[start:start + batch_size]).items():
+                    logger.info(f"Detected via LLM: {result.report_type}")
+                    results[file_path] = result
+        
+        # Stage 4: Manual selection (user interaction)
+        for file_path in pending:
+            if file_path in results:
+                continue
+            
+            with PROMPT_LOCK:
+                result = self._manual_selection(file_path)
+            if result:
+                logger.info(f"Detected via manual selection: {result.report_type}")
+                results[file_path] = result
+            else:
+                logger.warning(f"Could not detect report type for: {file_path.name}")
+        
+        return [results.get(file_path) for file_path in files]
+    
     def _match_filename(self, file_path: Path) -> Optional[DetectionResult]:
         """
         Match filename against configured patterns (Stage 1).
@@ -147,30 +206,22 @@ class ReportDetector:
         try:
             parser = self.parsers[file_format]
             df = parser.safe_parse(file_path)
-            text_content = parser.extract_text(file_path, max_chars=10000)
+            text_content = parser.cached_extract_text(file_path, max_chars=10000)
             
             if df is None and not text_content:
                 logger.warning(f"Could not extract content from {file_path.name}")
                 return None
             
-            # Get columns if DataFrame available
-            columns = list(df.columns) if df is not None and not df.empty else []
+            # Get columns if DataFrame available (lower-cased once per file)
+            columns = [str(c).lower() for c in df.columns] if df is not None and not df.empty else []
+            text_lower = text_content.lower() if text_content else ''
             
             # Check each report configuration
             scores = {}
             
-            for report_id, config in self.report_configs.items():
-                if not config.get('report_type', {}).get('enabled', True):
-                    continue
-                
-                identification = config.get('identification', {})
-                content_identifiers = identification.get('content_identifiers', {})
-                
-                if not content_identifiers:
-                    continue
-                
+            for report_id, (config, identifiers) in self.content_identifiers.items():
                 score, matched = self._calculate_content_score(
-                    columns, text_content, content_identifiers
+                    columns, text_lower, identifiers
                 )
                 
                 if score > 0:
@@ -198,15 +249,42 @@ class ReportDetector:
         
         return None
     
+    def _prepare_content_identifiers(self) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Prepare the content identifiers of all enabled report types.
+        
+        Returns:
+            Mapping of report ID to (config, identifiers), where each identifier
+            list holds (configured value, lower-cased value) pairs
+        """
+        prepared = {}
+        
+        for report_id, config in self.report_configs.items():
+            if not config.get('report_type', {}).get('enabled', True):
+                continue
+            
+            content_identifiers = config.get('identification', {}).get('content_identifiers', {})
+            if not content_identifiers:
+                continue
+            
+            identifiers = {
+                key: [(value, value.lower()) for value in content_identifiers.get(key, [])]
+                for key in ('required_columns', 'optional_columns',
+                            'required_keywords', 'optional_keywords')
+            }
+            prepared[report_id] = (config, identifiers)
+        
+        return prepared
+    
     def _calculate_content_score(self, columns: List[str], text: str, 
-                                identifiers: Dict[str, Any]) -> Tuple[float, List[str]]:
+                                identifiers: Dict[str, List[Tuple[str, str]]]) -> Tuple[float, List[str]]:
         """
         Calculate content matching score.
         
         Args:
-            columns: List of column names
-            text: Text content
-            identifiers: Content identifiers configuration
+            columns: Lower-cased column names
+            text: Lower-cased text content
+            identifiers: Prepared content identifiers (see _prepare_content_identifiers)
             
         Returns:
             Tuple of (score, matched patterns)
@@ -215,37 +293,91 @@ class ReportDetector:
         matched = []
         
         # Check required columns
-        required_cols = identifiers.get('required_columns', [])
-        for col in required_cols:
-            if any(col.lower() in c.lower() for c in columns):
+        for col, col_lower in identifiers['required_columns']:
+            if any(col_lower in c for c in columns):
                 score += 2  # Higher weight for required columns
                 matched.append(f"column:{col}")
         
         # Check optional columns
-        optional_cols = identifiers.get('optional_columns', [])
-        for col in optional_cols:
-            if any(col.lower() in c.lower() for c in columns):
+        for col, col_lower in identifiers['optional_columns']:
+            if any(col_lower in c for c in columns):
                 score += 1
                 matched.append(f"optional_column:{col}")
         
         # Check required keywords in text
-        required_keywords = identifiers.get('required_keywords', [])
-        text_lower = text.lower()
-        
-        for keyword in required_keywords:
-            if keyword.lower() in text_lower:
+        for keyword, keyword_lower in identifiers['required_keywords']:
+            if keyword_lower in text:
                 score += 1.5
                 matched.append(f"keyword:{keyword}")
         
         # Check optional keywords
-        optional_keywords = identifiers.get('optional_keywords', [])
-        for keyword in optional_keywords:
-            if keyword.lower() in text_lower:
+        for keyword, keyword_lower in identifiers['optional_keywords']:
+            if keyword_lower in text:
                 score += 0.5
                 matched.append(f"optional_keyword:{keyword}")
         
         return score, matched
     
+    def _classify_batch_with_llm(self, files: List[Path]) -> Dict[Path, DetectionResult]:
+        """
+        Classify several files using LLM, one request per report type (Stage 3).
+        
+        As in _classify_with_llm, a file is assigned the first report type (in
+        configuration order) the LLM confirms with sufficient confidence. If a
+        batch request fails, the affected files are classified one by one.
+        
+        Args:
+            files: Paths of the files to classify
+            
+        Returns:
+            Detection results of the classified files
+        """
+        results: Dict[Path, DetectionResult] = {}
+        contents: Dict[Path, str] = {}
+        
+        for file_path in files:
+            file_format = file_path.suffix[1:].lower()
+            if file_format not in self.parsers:
+                continue
+            
+            try:
+                text_content = self.parsers[file_format].cached_extract_text(
+                    file_path, max_chars=LLM_BATCH_TEXT_CHARS
+                )
+            except Exception as e:
+                logger.error(f"LLM classification failed for {file_path.name}: {e}")
+                continue
+            
+            if text_content:
+                contents[file_path] = text_content
+        
+        for report_id, config, llm_config, prompt in self._llm_candidates():
+            batch = [file_path for file_path in contents if file_path not in results]
+            if not batch:
+                break
+            
+            responses = self.llm_handler.classify_batch(
+                [contents[file_path] for file_path in batch],
+                prompt,
+                options=['JA', 'NEIN', 'YES', 'NO']
+            )
+            
+            if responses is None:
+                # Fall back to classifying the remaining files one by one
+                logger.warning("Batch LLM classification failed, classifying files individually")
+                for file_path in batch:
+                    result = self._classify_with_llm(file_path)
+                    if result:
+                        results[file_path] = result
+                break
+            
+            for file_path, response in zip(batch, responses):
+                result = self._llm_detection_result(report_id, config, llm_config, response)
+                if result:
+                    results[file_path] = result
+        
+        return results
+    
     def _classify_with_llm(self, file_path: Path) -> Optional[DetectionResult]:
         """
         Classify using LLM (Stage 3).
@@ -267,57 +399,97 @@ class ReportDetector:
         
         try:
             parser = self.parsers[file_format]
-            text_content = parser.extract_text(file_path, max_chars=5000)
+            text_content = parser.cached_extract_text(file_path, max_chars=5000)
             
             if not text_content:
                 return None
             
-            # Try each report configuration with LLM
-            for report_id, config in self.report_configs.items():
-                if not config.get('report_type', {}).get('enabled', True):
-                    continue
-                
-                llm_config = config.get('identification', {}).get('llm_classification', {})
-                
-                if not llm_config.get('enabled', False):
-                    continue
-                
-                prompt = llm_config.get('prompt', '')
-                if not prompt:
-                    continue
-                
-                # Classify with LLM
-                response = self.llm_handler.classify(
-                    text_content,
-                    prompt,
-                    options=['JA', 'NEIN', 'YES', 'NO']
-                )
-                
-                if response.error:
-                    logger.error(f"LLM classification error: {response.error}")
-                    continue
-                
-                # Check response
-                answer = response.content.upper()
-                
-                if 'JA' in answer or 'YES' in answer:
-                    confidence_threshold = llm_config.get('confidence_threshold', 0.7)
-                    
-                    if response.confidence >= confidence_threshold:
-                        return DetectionResult(
-                            report_type=report_id,
-                            report_name=config['report_type']['name'],
-                            confidence=response.confidence,
-                            detection_method='llm',
-                            matched_patterns=[f"LLM classification: {response.content}"],
-                            report_config=config
-                        )
+            # Collect the LLM prompts of all enabled report configurations
+            candidates = self._llm_candidates()
+            
+            if not candidates:
+                return None
+            
+            # Classify against all candidates concurrently
+            responses = self.llm_handler.classify_many(
+                text_content,
+                [prompt for _, _, _, prompt in candidates],
+                options=['JA', 'NEIN', 'YES', 'NO']
+            )
+            
+            for (report_id, config, llm_config, _), response in zip(candidates, responses):
+                result = self._llm_detection_result(report_id, config, llm_config, response)
+                if result:
+                    return result
             
         except Exception as e:
             logger.error(f"LLM classification failed for {file_path.name}: {e}")
         
         return None
     
+    def _llm_candidates(self) -> List[Tuple[str, Dict[str, Any], Dict[str, Any], str]]:
+        """
+        Collect the LLM classification prompts of all enabled report configurations.
+        
+        Returns:
+            List of (report_id, config, llm_config, prompt) in configuration order
+        """
+        candidates = []
+        
+        for report_id, config in self.report_configs.items():
+            if not config.get('report_type', {}).get('enabled', True):
+                continue
+            
+            llm_config = config.get('identification', {}).get('llm_classification', {})
+            
+            if not llm_config.get('enabled', False):
+                continue
+            
+            prompt = llm_config.get('prompt', '')
+            if not prompt:
+                continue
+            
+            candidates.append((report_id, config, llm_config, prompt))
+        
+        return candidates
+    
+    def _llm_detection_result(self, report_id: str, config: Dict[str, Any],
+                              llm_config: Dict[str, Any],
+                              response: LLMResponse) -> Optional[DetectionResult]:
+        """
+        Turn a positive LLM classification response into a detection result.
+        
+        Args:
+            report_id: Report type the prompt asked about
+            config: Report configuration
+            llm_config: LLM classification configuration of the report type
+            response: LLM response
+            
+        Returns:
+            Detection result or None if the answer was negative or not confident enough
+        """
+        if response.error:
+            logger.error(f"LLM classification error: {response.error}")
+            return None
+        
+        # Check response
+        answer = response.content.upper()
+        
+        if 'JA' in answer or 'YES' in answer:
+            confidence_threshold = llm_config.get('confidence_threshold', 0.7)
+            
+            if response.confidence >= confidence_threshold:
+                return DetectionResult(
+                    report_type=report_id,
+                    report_name=config['report_type']['name'],
+                    confidence=response.confidence,
+                    detection_method='llm',
+                    matched_patterns=[f"LLM classification: {response.content}"],
+                    report_config=config
+                )
+        
+        return None
+    
     def _manual_selection(self, file_path: Path) -> Optional[DetectionResult]:
         """
         Manual report type selection by user (Stage 4).
@@ -422,7 +594,7 @@ class ReportDetector:
                 print(df.head(3).to_string(max_cols=5, max_colwidth=20))
             
             # Get text preview
-            text = parser.extract_text(file_path, max_chars=1000)
+            text = parser.cached_extract_text(file_path, max_chars=1000)
             
             if text:
                 print(f"\nText preview (first 500 chars):")
@@ -1,14 +1,71 @@
 import logging
 import json
+import tempfile
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-from jinja2 import Template
+import numpy as np
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from markupsafe import escape
 
 from core.report_analyzer import AnalysisResult
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Compiled templates are persisted here so that subsequent CLI runs skip
+# Jinja's parse/compile step.
+JINJA_CACHE_DIR = Path(tempfile.gettempdir()) / "kpi_jinja_cache"
+
+_jinja_env: Optional[Environment] = None
+
+
+def _get_jinja_env() -> Environment:
+    """Return the shared Jinja environment, creating it on first use."""
+    global _jinja_env
+    if _jinja_env is None:
+        JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _jinja_env = Environment(
+            loader=FileSystemLoader(str(TEMPLATE_DIR)),
+            bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+            # The report is generated from our own analysis results; the few
+            # free-text fields are escaped once in _prepare_report_for_html
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    return _jinja_env
+
+
+# Number of list entries shown in the HTML report; the remainder is only counted
+HTML_LIST_PREVIEW_LIMITS = {
+    'failed_backup_details': 10,
+    'missing_backup_days': 15,
+    'devices_without_owner_list': 20,
+    'inactive_devices_list': 20,
+    'recent_registrations_list': 15
+}
+VM_MISSING_DAYS_PREVIEW_LIMIT = 10
+
+# Free-text fields of list entries that are HTML-escaped before rendering
+HTML_ESCAPED_FIELDS = ('displayName',)
+
+MONTHS_DE = ('Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
+             'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember')
+
+
+@lru_cache(maxsize=128)
+def format_month(date_str: str) -> str:
+    """Convert '2025-08' to 'August 2025'"""
+    try:
+        year, month = date_str.split('-')
+        return f"{MONTHS_DE[int(month) - 1]} {year}"
+    except (AttributeError, ValueError, IndexError):
+        return date_str
+
 
 class ResultHandler:
     """Handles analysis results, formatting, and output generation."""
@@ -322,809 +379,116 @@ class ResultHandler:
     def _generate_html_report(self, results_data: Dict[str, Any],
                             output_path: Path) -> Path:
         """Generate HTML report from results."""
-        html_template = """
-        <!DOCTYPE html>
-        <html lang="de">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Veeam Backup Report Analysis</title>
-            <style>
-                * { box-sizing: border-box; }
-                body {
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background-color: #f5f5f5;
-                    font-size: 14px;
-                }
-                .container {
-                    max-width: 1400px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 30px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }
-                .header {
-                    border-bottom: 2px solid #e0e0e0;
-                    padding-bottom: 20px;
-                    margin-bottom: 30px;
-                }
-                .metadata {
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                    gap: 15px;
-                    margin-bottom: 30px;
-                }
-                .metric-card {
-                    background: #f8f9fa;
-                    padding: 15px;
-                    border-radius: 8px;
-                    text-align: center;
-                }
-                .metric-value {
-                    font-size: 2em;
-                    font-weight: bold;
-                    color: #2c3e50;
-                }
-                .metric-label {
-                    color: #6c757d;
-                    margin-top: 5px;
-                    font-size: 0.9em;
-                }
-                .report-card {
-                    border: 1px solid #dee2e6;
-                    border-radius: 8px;
-                    margin-bottom: 20px;
-                    overflow: hidden;
-                }
-                .report-header {
-                    padding: 15px 20px;
-                    font-weight: bold;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }
-                .report-content {
-                    padding: 25px;
-                }
-                .risk-niedrig { background-color: #d4edda; color: #155724; }
-                .risk-mittel { background-color: #fff3cd; color: #856404; }
-                .risk-hoch { background-color: #f8d7da; color: #721c24; }
-                .score {
-                    font-size: 1.3em;
-                    font-weight: bold;
-                    padding: 5px 15px;
-                    border-radius: 5px;
-                    background-color: white;
-                }
-                .section {
-                    margin-bottom: 30px;
-                }
-                .section h3 {
-                    margin-top: 0;
-                    margin-bottom: 15px;
-                    padding-bottom: 10px;
-                    border-bottom: 2px solid #e0e0e0;
-                    color: #2c3e50;
-                }
-                .info-grid {
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 15px;
-                    margin-bottom: 20px;
-                }
-                .info-item {
-                    background: #f8f9fa;
-                    padding: 12px;
-                    border-radius: 5px;
-                }
-                .info-label {
-                    font-size: 0.85em;
-                    color: #6c757d;
-                    margin-bottom: 5px;
-                }
-                .info-value {
-                    font-weight: 600;
-                    color: #2c3e50;
-                    font-size: 1.1em;
-                }
-                .vm-card {
-                    border: 1px solid #dee2e6;
-                    border-radius: 6px;
-                    margin-bottom: 15px;
-                    overflow: hidden;
-                }
-                .vm-header {
-                    background: #f8f9fa;
-                    padding: 12px 15px;
-                    font-weight: 600;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    border-bottom: 1px solid #dee2e6;
-                }
-                .vm-name {
-                    font-size: 1.1em;
-                    color: #2c3e50;
-                }
-                .vm-score {
-                    padding: 4px 12px;
-                    border-radius: 4px;
-                    font-size: 0.95em;
-                }
-                .vm-score-100 { background-color: #d4edda; color: #155724; }
-                .vm-score-warning { background-color: #fff3cd; color: #856404; }
-                .vm-score-danger { background-color: #f8d7da; color: #721c24; }
-                .vm-content {
-                    padding: 15px;
-                }
-                .vm-stats {
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-                    gap: 10px;
-                    margin-bottom: 15px;
-                }
-                .vm-stat {
-                    background: #f8f9fa;
-                    padding: 10px;
-                    border-radius: 4px;
-                    text-align: center;
-                }
-                .vm-stat-label {
-                    font-size: 0.8em;
-                    color: #6c757d;
-                    margin-bottom: 3px;
-                }
-                .vm-stat-value {
-                    font-weight: 600;
-                    color: #2c3e50;
-                    font-size: 1.1em;
-                }
-                .missing-days {
-                    background: #fff3cd;
-                    padding: 10px;
-                    border-radius: 4px;
-                    margin-top: 10px;
-                }
-                .missing-days-critical {
-                    background: #f8d7da;
-                }
-                .missing-days h5 {
-                    margin: 0 0 8px 0;
-                    color: #856404;
-                }
-                .missing-days-critical h5 {
-                    color: #721c24;
-                }
-                .day-list {
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 5px;
-                    font-size: 0.85em;
-                }
-                .day-tag {
-                    background: white;
-                    padding: 3px 8px;
-                    border-radius: 3px;
-                    border: 1px solid #ffc107;
-                }
-                .failed-backup {
-                    background: #f8d7da;
-                    border: 1px solid #f5c6cb;
-                    padding: 10px;
-                    border-radius: 4px;
-                    margin-top: 10px;
-                }
-                .failed-backup h5 {
-                    margin: 0 0 8px 0;
-                    color: #721c24;
-                }
-                .summary-box {
-                    background: #e7f3ff;
-                    border-left: 4px solid #0066cc;
-                    padding: 15px;
-                    border-radius: 4px;
-                    margin-bottom: 20px;
-                }
-                table {
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-top: 10px;
-                    font-size: 0.9em;
-                }
-                th, td {
-                    padding: 8px;
-                    text-align: left;
-                    border-bottom: 1px solid #dee2e6;
-                }
-                th {
-                    background-color: #f8f9fa;
-                    font-weight: 600;
-                    color: #495057;
-                }
-                .footer {
-                    margin-top: 40px;
-                    padding-top: 20px;
-                    border-top: 1px solid #e0e0e0;
-                    text-align: center;
-                    color: #6c757d;
-                    font-size: 0.9em;
-                }
-                .filter-section {
-                    background: #f8f9fa;
-                    padding: 20px;
-                    border-radius: 8px;
-                    margin-bottom: 30px;
-                    border: 1px solid #dee2e6;
-                }
-                .filter-label {
-                    font-weight: 600;
-                    color: #2c3e50;
-                    margin-bottom: 10px;
-                    display: block;
-                    font-size: 1em;
-                }
-                .report-select {
-                    width: 100%;
-                    padding: 12px 16px;
-                    font-size: 1em;
-                    border: 2px solid #dee2e6;
-                    border-radius: 6px;
-                    background-color: white;
-                    color: #2c3e50;
-                    cursor: pointer;
-                    transition: all 0.3s ease;
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                }
-                .report-select:hover {
-                    border-color: #0066cc;
-                }
-                .report-select:focus {
-                    outline: none;
-                    border-color: #0066cc;
-                    box-shadow: 0 0 0 3px rgba(0, 102, 204, 0.1);
-                }
-                .report-card {
-                    display: none;
-                }
-                .report-card.active {
-                    display: block;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🔍 Backup Report Analysis</h1>
-                    <p>Analyse erstellt am {{ metadata.analysis_timestamp }}</p>
-                </div>
-
-                <div class="filter-section">
-                    <label class="filter-label" for="reportSelector">Bericht auswählen:</label>
-                    <select id="reportSelector" class="report-select">
-                        <option value="all">Alle Berichte anzeigen ({{ metadata.total_files }} Berichte)</option>
-                        {% for report in reports %}
-                        <option value="report-{{ loop.index0 }}"
-                                data-score="{{ report.score }}"
-                                data-risk="{{ report.risk_level }}">
-                            {{ report.report_type.replace('_', ' ').title() }} - {{ report.file_info.name }}
-                            (Score: {{ report.score }}/100)
-                        </option>
-                        {% endfor %}
-                    </select>
-                </div>
-
-                <div class="metadata">
-                    <div class="metric-card">
-                        <div class="metric-value">{{ metadata.total_files }}</div>
-                        <div class="metric-label">Analysierte Dateien</div>
-                    </div>
-                    <div class="metric-card">
-                        <div class="metric-value">{{ "%.1f"|format(metadata.success_rate) }}%</div>
-                        <div class="metric-label">Erfolgsrate</div>
-                    </div>
-                    <div class="metric-card">
-                        <div class="metric-value">{{ "%.1f"|format(metadata.average_score) }}</div>
-                        <div class="metric-label">Durchschnittsscore</div>
-                    </div>
-                </div>
-
-                {% for report in reports %}
-                <div class="report-card" data-report-index="report-{{ loop.index0 }}">
-                    <div class="report-header risk-{{ report.risk_level }}">
-                        <span>{{ report.report_type.replace('_', ' ').title() }} - {{ report.file_info.name }}</span>
-                        <span class="score">{{ report.score }}/100</span>
-                    </div>
-                    <div class="report-content">
-
-                        <div class="section">
-                            <h3>📋 Report-Informationen</h3>
-                            <div class="info-grid">
-                                <div class="info-item">
-                                    <div class="info-label">Berichtszeitraum</div>
-                                    <div class="info-value">
-                                        {% if report.extracted_data.vm_analysis and report.extracted_data.vm_analysis.report_month %}
-                                            {{ format_month(report.extracted_data.vm_analysis.report_month) }}
-                                        {% elif report.extracted_data.report_month %}
-                                            {{ format_month(report.extracted_data.report_month) }}
-                                        {% else %}
-                                            {{ format_month(report.file_info.report_period) }}
-                                        {% endif %}
-                                    </div>
-                                </div>
-
-                                {% if report.report_type in ['veeam_backup', 'keepit_backup'] %}
-                                <div class="info-item">
-                                    <div class="info-label">Gesamtanzahl Backups</div>
-                                    <div class="info-value">{{ report.extracted_data.total_backups }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Erfolgreiche Backups</div>
-                                    <div class="info-value" style="color: #28a745;">{{ report.extracted_data.successful_backups }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Fehlgeschlagene Backups</div>
-                                    <div class="info-value" style="color: #dc3545;">{{ report.extracted_data.failed_backups }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Erfolgsrate</div>
-                                    <div class="info-value">{{ "%.2f"|format(report.extracted_data.success_rate) }}%</div>
-                                </div>
-                                {% if report.report_type == 'veeam_backup' %}
-                                <div class="info-item">
-                                    <div class="info-label">Anzahl VMs</div>
-                                    <div class="info-value">{{ report.extracted_data.unique_vms }}</div>
-                                </div>
-                                {% elif report.report_type == 'keepit_backup' %}
-                                <div class="info-item">
-                                    <div class="info-label">Anzahl Services</div>
-                                    <div class="info-value">{{ report.extracted_data.unique_connectors }}</div>
-                                </div>
-                                {% endif %}
-
-                                {% elif report.report_type == 'entra_devices' %}
-                                <div class="info-item">
-                                    <div class="info-label">Gesamtanzahl Geräte</div>
-                                    <div class="info-value">{{ report.extracted_data.total_devices }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Inaktive Geräte (>90 Tage)</div>
-                                    <div class="info-value" style="color: #dc3545;">{{ report.extracted_data.inactive_devices }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Inaktivitätsrate</div>
-                                    <div class="info-value">{{ "%.1f"|format(report.extracted_data.inactive_rate) }}%</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Geräte ohne Besitzer</div>
-                                    <div class="info-value" style="color: #ffc107;">{{ report.extracted_data.devices_without_owner }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Nicht-konforme Geräte</div>
-                                    <div class="info-value" style="color: #dc3545;">{{ report.extracted_data.non_compliant_devices }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Compliance-Rate</div>
-                                    <div class="info-value" style="color: #28a745;">{{ "%.1f"|format(report.extracted_data.compliance_rate) }}%</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Kürzlich registriert (30 Tage)</div>
-                                    <div class="info-value">{{ report.extracted_data.recent_registrations }}</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-label">Verwaltete Geräte</div>
-                                    <div class="info-value">{{ report.extracted_data.managed_devices }}</div>
-                                </div>
-                                {% endif %}
-                            </div>
-                        </div>
-
-                        {% if report.extracted_data.vm_analysis and report.extracted_data.vm_analysis.vms %}
-                        <div class="section">
-                            <h3>🖥️ VM-Analyse</h3>
-
-                            {% if report.extracted_data.vm_analysis.summary %}
-                            <div class="summary-box">
-                                <strong>Zusammenfassung:</strong><br>
-                                VMs gesamt: {{ report.extracted_data.vm_analysis.summary.total_vms }}<br>
-                                Durchschnittliche Erfolgsrate: {{ "%.1f"|format(report.extracted_data.vm_analysis.summary.average_success_rate) }}%<br>
-                                Durchschnittlicher Score: {{ "%.1f"|format(report.extracted_data.vm_analysis.summary.average_score) }}
-                            </div>
-                            {% endif %}
-
-                            {% for vm_name, vm_data in report.extracted_data.vm_analysis.vms.items() %}
-                            <div class="vm-card">
-                                <div class="vm-header">
-                                    <span class="vm-name">{{ vm_name }}</span>
-                                    <span class="vm-score {% if vm_data.score == 100 %}vm-score-100{% elif vm_data.score >= 80 %}vm-score-warning{% else %}vm-score-danger{% endif %}">
-                                        Score: {{ "%.0f"|format(vm_data.score) }}/100
-                                    </span>
-                                </div>
-                                <div class="vm-content">
-                                    <div class="vm-stats">
-                                        <div class="vm-stat">
-                                            <div class="vm-stat-label">Gesamt</div>
-                                            <div class="vm-stat-value">{{ vm_data.total_backups }}</div>
-                                        </div>
-                                        <div class="vm-stat">
-                                            <div class="vm-stat-label">Erfolgreich</div>
-                                            <div class="vm-stat-value" style="color: #28a745;">{{ vm_data.successful_backups }}</div>
-                                        </div>
-                                        <div class="vm-stat">
-                                            <div class="vm-stat-label">Fehlgeschlagen</div>
-                                            <div class="vm-stat-value" style="color: #dc3545;">{{ vm_data.failed_backups }}</div>
-                                        </div>
-                                        <div class="vm-stat">
-                                            <div class="vm-stat-label">Erfolgsrate</div>
-                                            <div class="vm-stat-value">{{ "%.1f"|format(vm_data.success_rate) }}%</div>
-                                        </div>
-                                    </div>
-
-                                    {% if vm_data.missing_days_critical > 0 %}
-                                    <div class="missing-days missing-days-critical">
-                                        <h5>⚠️ Kritische fehlende Backups: {{ vm_data.missing_days_critical }} Tag(e)</h5>
-                                        <div class="day-list">
-                                            {% for day in vm_data.missing_days_list[:10] %}
-                                            <span class="day-tag">{{ day }}</span>
-                                            {% endfor %}
-                                            {% if vm_data.missing_days_list|length > 10 %}
-                                            <span class="day-tag">... und {{ vm_data.missing_days_list|length - 10 }} weitere</span>
-                                            {% endif %}
-                                        </div>
-                                    </div>
-                                    {% elif vm_data.missing_days_recoverable > 0 %}
-                                    <div class="missing-days">
-                                        <h5>ℹ️ Wiederherstellbare fehlende Backups: {{ vm_data.missing_days_recoverable }} Tag(e)</h5>
-                                        <p style="margin: 5px 0; font-size: 0.85em;">
-                                            {% if vm_data.missing_days_recoverable == 1 %}
-                                                Dieser fehlende Tag wurde am Folgetag erfolgreich gesichert: {{ vm_data.missing_days_list[0] }}
-                                            {% else %}
-                                                Diese fehlenden Tage wurden am Folgetag erfolgreich gesichert:
-                                                {% for day in vm_data.missing_days_list[:vm_data.missing_days_recoverable] %}
-                                                    {{ day }}{% if not loop.last %}, {% endif %}
-                                                {% endfor %}
-                                            {% endif %}
-                                        </p>
-                                    </div>
-                                    {% endif %}
-
-                                    {% if vm_data.failed_backup_details %}
-                                    <div class="failed-backup">
-                                        <h5>❌ Fehlgeschlagene Backups</h5>
-                                        <table>
-                                            <thead>
-                                                <tr>
-                                                    <th>Datum</th>
-                                                    <th>Details</th>
-                                                </tr>
-                                            </thead>
-                                            <tbody>
-                                                {% for failed in vm_data.failed_backup_details %}
-                                                <tr>
-                                                    <td>{{ failed['Start Time'] if failed['Start Time'] else 'N/A' }}</td>
-                                                    <td>{{ failed.Details if failed.Details else '-' }}</td>
-                                                </tr>
-                                                {% endfor %}
-                                            </tbody>
-                                        </table>
-                                    </div>
-                                    {% endif %}
-                                </div>
-                            </div>
-                            {% endfor %}
-                        </div>
-                        {% endif %}
-
-                        {% if report.report_type == 'keepit_backup' %}
-                        <div class="section">
-                            <h3>📊 Service-Breakdown</h3>
-
-                            {% if report.extracted_data.connector_breakdown %}
-                            <div class="summary-box">
-                                <strong>Backup-Anzahl pro Service:</strong><br>
-                                {% for connector, count in report.extracted_data.connector_breakdown.items() %}
-                                    {{ connector }}: {{ count }}<br>
-                                {% endfor %}
-                            </div>
-                            {% endif %}
-
-                            {% if report.extracted_data.type_breakdown %}
-                            <div class="summary-box" style="margin-top: 15px;">
-                                <strong>Backup-Typen:</strong><br>
-                                {% for type, count in report.extracted_data.type_breakdown.items() %}
-                                    {{ type }}: {{ count }}<br>
-                                {% endfor %}
-                            </div>
-                            {% endif %}
-
-                            {% if report.extracted_data.failed_backup_details %}
-                            <div class="failed-backup" style="margin-top: 15px;">
-                                <h5>❌ Fehlgeschlagene Backups ({{ report.extracted_data.failed_backup_details|length }})</h5>
-                                <table>
-                                    <thead>
-                                        <tr>
-                                            <th>Service</th>
-                                            <th>Typ</th>
-                                            <th>Startzeit</th>
-                                            <th>Beschreibung</th>
-                                        </tr>
-                                    </thead>
-                                    <tbody>
-                                        {% for failed in report.extracted_data.failed_backup_details[:10] %}
-                                        <tr>
-                                            <td>{{ failed.connector }}</td>
-                                            <td>{{ failed.type }}</td>
-                                            <td>{{ failed.start_time }}</td>
-                                            <td>{{ failed.description }}</td>
-                                        </tr>
-                                        {% endfor %}
-                                        {% if report.extracted_data.failed_backup_details|length > 10 %}
-                                        <tr>
-                                            <td colspan="4" style="text-align: center; font-style: italic;">
-                                                ... und {{ report.extracted_data.failed_backup_details|length - 10 }} weitere fehlgeschlagene Backups
-                                            </td>
-                                        </tr>
-                                        {% endif %}
-                                    </tbody>
-                                </table>
-                            </div>
-                            {% endif %}
-
-                            {% if report.extracted_data.missing_backup_days %}
-                            <div class="missing-days" style="margin-top: 15px;">
-                                <h5>⚠️ Tage ohne Backups ({{ report.extracted_data.missing_backup_days|length }})</h5>
-                                <div class="day-list">
-                                    {% for day in report.extracted_data.missing_backup_days[:15] %}
-                                    <span class="day-tag">{{ day }}</span>
-                                    {% endfor %}
-                                    {% if report.extracted_data.missing_backup_days|length > 15 %}
-                                    <span class="day-tag">... und {{ report.extracted_data.missing_backup_days|length - 15 }} weitere</span>
-                                    {% endif %}
-                                </div>
-                            </div>
-                            {% endif %}
-                        </div>
-                        {% endif %}
-
-                        {% if report.report_type == 'entra_devices' %}
-                        <div class="section">
-                            <h3>💻 Betriebssystem-Verteilung</h3>
-                            {% if report.extracted_data.os_breakdown %}
-                            <div class="summary-box">
-                                <strong>Geräte nach Betriebssystem:</strong><br>
-                                {% for os, count in report.extracted_data.os_breakdown.items() %}
-                                    {{ os }}: {{ count }}<br>
-                                {% endfor %}
-                            </div>
-                            {% endif %}
-                        </div>
-
-                        {% if report.extracted_data.trust_type_breakdown %}
-                        <div class="section">
-                            <h3>🔐 Trust Type-Verteilung</h3>
-                            <div class="summary-box">
-                                <strong>Geräte nach Trust Type:</strong><br>
-                                {% for trust_type, count in report.extracted_data.trust_type_breakdown.items() %}
-                                    {{ trust_type }}: {{ count }}<br>
-                                {% endfor %}
-                            </div>
-                        </div>
-                        {% endif %}
-
-                        {% if report.extracted_data.devices_without_owner_list and report.extracted_data.devices_without_owner_list|length > 0 %}
-                        <div class="section">
-                            <h3>👤 Geräte ohne Besitzer ({{ report.extracted_data.devices_without_owner_list|length }})</h3>
-                            <div class="summary-box">
-                                {% for device in report.extracted_data.devices_without_owner_list[:20] %}
-                                    <strong>{{ device.displayName }}</strong><br>
-                                    <span style="font-size: 0.9em; color: #666;">
-                                        OS: {{ device.operatingSystem }}
-                                        {% if device.operatingSystemVersion %} ({{ device.operatingSystemVersion }}){% endif %}
-                                        | Registriert: {{ device.registrationTime }}
-                                    </span><br><br>
-                                {% endfor %}
-                                {% if report.extracted_data.devices_without_owner_list|length > 20 %}
-                                <em>... und {{ report.extracted_data.devices_without_owner_list|length - 20 }} weitere Geräte ohne Besitzer</em>
-                                {% endif %}
-                            </div>
-                        </div>
-                        {% endif %}
-
-                        {% if report.extracted_data.inactive_devices_list and report.extracted_data.inactive_devices_list|length > 0 %}
-                        <div class="section">
-                            <h3>⏰ Inaktive Geräte >90 Tage ({{ report.extracted_data.inactive_devices_list|length }})</h3>
-                            <div class="summary-box">
-                                {% for device in report.extracted_data.inactive_devices_list[:20] %}
-                                    <strong>{{ device.displayName }}</strong><br>
-                                    <span style="font-size: 0.9em; color: #666;">
-                                        OS: {{ device.operatingSystem }}
-                                        | Besitzer: {{ device.registeredOwners if device.registeredOwners else 'Kein Besitzer' }}
-                                        | Letzter Sign-In: {{ device.approximateLastSignInDateTime }}
-                                    </span><br><br>
-                                {% endfor %}
-                                {% if report.extracted_data.inactive_devices_list|length > 20 %}
-                                <em>... und {{ report.extracted_data.inactive_devices_list|length - 20 }} weitere inaktive Geräte</em>
-                                {% endif %}
-                            </div>
-                        </div>
-                        {% endif %}
-
-                        {% if report.extracted_data.recent_registrations_list and report.extracted_data.recent_registrations_list|length > 0 %}
-                        <div class="section">
-                            <h3>🆕 Kürzlich registrierte Geräte ({{ report.extracted_data.recent_registrations_list|length }})</h3>
-                            <div class="summary-box">
-                                {% for device in report.extracted_data.recent_registrations_list[:15] %}
-                                    <strong>{{ device.displayName }}</strong><br>
-                                    <span style="font-size: 0.9em; color: #666;">
-                                        OS: {{ device.operatingSystem }}
-                                        | Besitzer: {{ device.registeredOwners if device.registeredOwners else 'Kein Besitzer' }}
-                                        | Registriert: {{ device.registrationTime }}
-                                    </span><br><br>
-                                {% endfor %}
-                                {% if report.extracted_data.recent_registrations_list|length > 15 %}
-                                <em>... und {{ report.extracted_data.recent_registrations_list|length - 15 }} weitere kürzlich registrierte Geräte</em>
-                                {% endif %}
-                            </div>
-                        </div>
-                        {% endif %}
-                        {% endif %}
-
-                        {% if report.analysis_details.issues %}
-                        <div class="section">
-                            <h3>⚠️ Gefundene Probleme</h3>
-                            <ul>
-                            {% for issue in report.analysis_details.issues %}
-                                <li>{{ issue }}</li>
-                            {% endfor %}
-                            </ul>
-                        </div>
-                        {% endif %}
-
-                    </div>
-                </div>
-                {% endfor %}
-
-                <div class="footer">
-                    <p>Generiert vom Report Analysis Tool v{{ metadata.tool_version }}</p>
-                    <p>🤖 Powered by Claude Code & Ollama LLM</p>
-                </div>
-            </div>
-
-            <script>
-                // Report filtering functionality
-                (function() {
-                    const selector = document.getElementById('reportSelector');
-                    const reportCards = document.querySelectorAll('.report-card');
-                    const metadataSection = document.querySelector('.metadata');
-
-                    // Function to show/hide reports based on selection
-                    function filterReports(selectedValue) {
-                        if (selectedValue === 'all') {
-                            // Show all reports and metadata
-                            reportCards.forEach(card => card.classList.add('active'));
-                            if (metadataSection) metadataSection.style.display = 'grid';
-                        } else {
-                            // Hide all first
-                            reportCards.forEach(card => card.classList.remove('active'));
-
-                            // Show only selected report
-                            const selectedCard = document.querySelector(`[data-report-index="${selectedValue}"]`);
-                            if (selectedCard) {
-                                selectedCard.classList.add('active');
-                            }
-
-                            // Hide metadata when single report is shown
-                            if (metadataSection) metadataSection.style.display = 'none';
-                        }
-
-                        // Update URL without reloading page
-                        const url = new URL(window.location);
-                        if (selectedValue === 'all') {
-                            url.searchParams.delete('report');
-                        } else {
-                            url.searchParams.set('report', selectedValue);
-                        }
-                        window.history.pushState({}, '', url);
-                    }
-
-                    // Handle selection change
-                    selector.addEventListener('change', function() {
-                        filterReports(this.value);
-                    });
-
-                    // Check URL parameters on page load
-                    function initializeFromURL() {
-                        const params = new URLSearchParams(window.location.search);
-                        const reportParam = params.get('report');
-
-                        if (reportParam) {
-                            // Set the selector to the specified report
-                            selector.value = reportParam;
-                            filterReports(reportParam);
-                        } else {
-                            // Default: show all reports
-                            filterReports('all');
-                        }
-                    }
-
-                    // Initialize on page load
-                    initializeFromURL();
-
-                    // Handle browser back/forward buttons
-                    window.addEventListener('popstate', function() {
-                        initializeFromURL();
-                    });
-                })();
-            </script>
-        </body>
-        </html>
-        """
-
-        def format_month(date_str):
-            """Convert '2025-08' to 'August 2025'"""
-            try:
-                from datetime import datetime
-                months_de = ['Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
-                           'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember']
-                year, month = date_str.split('-')
-                month_name = months_de[int(month) - 1]
-                return f"{month_name} {year}"
-            except:
-                return date_str
-
         try:
-            template = Template(html_template)
-            template.globals['format_month'] = format_month
-            html_content = template.render(
-                metadata=results_data["analysis_metadata"],
-                reports=results_data["reports"]
-            )
-            
+            template = _get_jinja_env().get_template("report.html")
+            reports = [self._prepare_report_for_html(report)
+                       for report in results_data["reports"]]
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                template.stream(
+                    metadata=results_data["analysis_metadata"],
+                    reports=reports
+                ).dump(f)
             
             return output_path
             
         except Exception as e:
             logger.error(f"Failed to generate HTML report: {e}")
             return output_path
+
+    def _prepare_report_for_html(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a formatted report with display values precomputed."""
+        extracted_data = report.get("extracted_data") or {}
+        vm_analysis = extracted_data.get("vm_analysis")
+
+        if vm_analysis and vm_analysis.get("report_month"):
+            month = vm_analysis["report_month"]
+        elif extracted_data.get("report_month"):
+            month = extracted_data["report_month"]
+        else:
+            month = report.get("file_info", {}).get("report_period")
+
+        # Slice long lists once here instead of inside the template
+        previews = {}
+        for key, limit in HTML_LIST_PREVIEW_LIMITS.items():
+            items = extracted_data.get(key) or []
+            previews[key] = {
+                "shown": [self._escape_html_fields(item) for item in items[:limit]],
+                "total": len(items),
+                "extra": max(0, len(items) - limit)
+            }
+
+        vms = []
+        if vm_analysis and vm_analysis.get("vms"):
+            for vm_name, vm_data in vm_analysis["vms"].items():
+                missing_days = vm_data.get("missing_days_list") or []
+                recoverable = vm_data.get("missing_days_recoverable", 0)
+                vms.append({
+                    **vm_data,
+                    "vm_name": escape(vm_name),
+                    "missing_days_preview": missing_days[:VM_MISSING_DAYS_PREVIEW_LIMIT],
+                    "missing_days_extra": max(0, len(missing_days) - VM_MISSING_DAYS_PREVIEW_LIMIT),
+                    "recoverable_days": missing_days[:recoverable]
+                })
+
+        # Section visibility, evaluated once instead of per template branch
+        flags = {
+            "show_vm_summary": bool(vm_analysis and vm_analysis.get("summary")),
+            "show_failed_backups": previews["failed_backup_details"]["total"] > 0,
+            "show_missing_backup_days": previews["missing_backup_days"]["total"] > 0,
+            "show_devices_without_owner": previews["devices_without_owner_list"]["total"] > 0,
+            "show_inactive_devices": previews["inactive_devices_list"]["total"] > 0,
+            "show_recent_registrations": previews["recent_registrations_list"]["total"] > 0
+        }
+
+        return {
+            **report,
+            "formatted_month": format_month(month),
+            "previews": previews,
+            "vms": vms,
+            "flags": flags
+        }
+
+    def _escape_html_fields(self, item: Any) -> Any:
+        """Return a list entry with its free-text fields HTML-escaped."""
+        if not isinstance(item, dict):
+            return item
+
+        escaped = {field: escape(item[field]) for field in HTML_ESCAPED_FIELDS
+                   if item.get(field) is not None}
+        return {**item, **escaped} if escaped else item
     
     def create_summary_stats(self, results: List[AnalysisResult]) -> Dict[str, Any]:
         """Create summary statistics for all results."""
         if not results:
             return {}
         
-        # Score distribution
-        scores = [r.score for r in results]
+        count = len(results)
+        scores = np.fromiter((r.score for r in results), dtype=np.float64, count=count)
+        processing_times = np.fromiter(
+            (r.processing_info.get('processing_time_seconds', 0) for r in results),
+            dtype=np.float64, count=count
+        )
+
+        # Score distribution (upper median via O(n) partition instead of a full sort)
+        mid = count // 2
         score_stats = {
-            "min": min(scores),
-            "max": max(scores),
-            "avg": sum(scores) / len(scores),
-            "median": sorted(scores)[len(scores) // 2]
+            "min": float(scores.min()),
+            "max": float(scores.max()),
+            "avg": float(scores.mean()),
+            "median": float(np.partition(scores, mid)[mid])
         }
-        
-        # Risk distribution
-        risk_counts = {}
-        for result in results:
-            risk = result.risk_level
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
-        
-        # Status distribution
-        status_counts = {}
-        for result in results:
-            status = result.result_status
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
+
+        # Risk and status distribution
+        risk_counts = dict(Counter(r.risk_level for r in results))
+        status_counts = dict(Counter(r.result_status for r in results))
+
         # Processing time stats
-        processing_times = [r.processing_info.get('processing_time_seconds', 0) 
-                          for r in results]
+        time_total = float(processing_times.sum())
         time_stats = {
-            "total": sum(processing_times),
-            "avg": sum(processing_times) / len(processing_times),
-            "min": min(processing_times),
-            "max": max(processing_times)
+            "total": time_total,
+            "avg": time_total / count,
+            "min": float(processing_times.min()),
+            "max": float(processing_times.max())
         }
         
         return {
@@ -1133,4 +497,4 @@ class ResultHandler:
             "status_distribution": status_counts,
             "processing_time_statistics": time_stats,
             "total_reports": len(results)
-        }
\ No newline at end of file
+        }
@@ -8,23 +8,38 @@ Automatisierte Analyse monatlicher Berichte mit LLM-Unterstützung über Ollama.
 import sys
 import argparse
 import logging
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import io
 
 # Fix Windows console encoding for emoji support
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8',
+                                  line_buffering=False, write_through=False)
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 # Add src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils import setup_logging, ConfigLoader, FileHandler, AnalysisLogger
-from core import OllamaHandler, ReportDetector, ReportAnalyzer, ResultHandler
+from utils import setup_logging, ConfigLoader, FileHandler, AnalysisLogger, LLMCache
+from core import OllamaHandler, CachedLLMHandler, ReportDetector, ReportAnalyzer, ResultHandler
+from parsers import BaseParser, prime_parse_cache
 
 logger = logging.getLogger(__name__)
 
+# Report month patterns used by _extract_report_month
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-\d{2}')  # 2025-08-01
+_FILENAME_DATE_RES = (
+    re.compile(r'(20\d{2})[_-]?(\d{2})'),  # 2024-01 or 2024_01 or 202401
+    re.compile(r'(\d{2})[_-]?(20\d{2})'),  # 01-2024 or 01_2024
+)
+
 
 class ReportAnalysisTool:
     """Main orchestrator for the report analysis process."""
@@ -46,13 +61,40 @@ class ReportAnalysisTool:
         
         # Initialize components
         self.file_handler = FileHandler(self.config)
+        if self.file_handler.cache_enabled:
+            BaseParser.enable_cache(
+                self.file_handler.cache_dir / "parsed",
+                ttl_hours=self.config.get("analysis", {}).get("cache_ttl_hours", 24)
+            )
+        pdf_page_processes = self.config.get("processing", {}).get("pdf_page_processes", 0)
+        if pdf_page_processes > 1:
+            # Only touch PDFParser when enabled; parser modules are imported lazily
+            from parsers import PDFParser
+            PDFParser.page_processes = pdf_page_processes
+        self.llm_cache = self._init_llm_cache()
         self.llm_handler = self._init_ollama_handler()
         self.detector = ReportDetector(self.config_loader, self.llm_handler)
         self.analyzer = ReportAnalyzer(self.llm_handler)
         self.result_handler = ResultHandler(self.config)
+
+        # Per-thread detector/analyzer instances for parallel processing
+        self._thread_state = threading.local()
+        
+        # Detection results from detect_batch() for the current run (None = detect per file)
+        self._detections = None
         
         logger.info("Report Analysis Tool initialized successfully")
     
+    def _init_llm_cache(self) -> Optional[LLMCache]:
+        """Initialize the persistent LLM response cache if caching is enabled."""
+        analysis_config = self.config.get("analysis", {})
+        
+        if not analysis_config.get("enable_caching", True):
+            return None
+        
+        cache_dir = Path(self.config.get("paths", {}).get("cache", "./cache")) / "llm"
+        return LLMCache(cache_dir, ttl_hours=analysis_config.get("cache_ttl_hours", 24))
+    
     def _init_ollama_handler(self) -> Optional[OllamaHandler]:
         """Initialize Ollama handler with configuration."""
         ollama_config = self.config.get("ollama", {})
@@ -67,14 +109,16 @@ class ReportAnalysisTool:
             )
             
             if handler.is_available():
-                logger.info(f"Ollama handler initialized with model: {ollama_config.get('model')}")
+                logger.info("Ollama handler initialized with model: %s", ollama_config.get('model'))
+                if self.llm_cache:
+                    return CachedLLMHandler(handler, self.llm_cache)
                 return handler
             else:
                 logger.warning("Ollama service not available - running without LLM support")
                 return None
                 
         except Exception as e:
-            logger.error(f"Failed to initialize Ollama handler: {e}")
+            logger.error("Failed to initialize Ollama handler: %s", e)
             return None
     
     def run(self, input_path: Optional[str] = None, 
@@ -98,51 +142,48 @@ class ReportAnalysisTool:
             if input_path:
                 files = [Path(input_path)]
                 if not files[0].exists():
-                    logger.error(f"Input file not found: {input_path}")
+                    logger.error("Input file not found: %s", input_path)
                     return False
             else:
                 validation_result = self.file_handler.validate_input_files()
                 files = validation_result["valid"]
                 
                 if validation_result["invalid"]:
-                    logger.warning(f"Found {len(validation_result['invalid'])} invalid files")
+                    logger.warning("Found %d invalid files", len(validation_result['invalid']))
                     for invalid_file in validation_result["invalid"]:
-                        logger.warning(f"  - {invalid_file}")
+                        logger.warning("  - %s", invalid_file)
                 
                 if not files:
                     logger.error("No valid input files found")
                     return False
             
-            logger.info(f"Processing {len(files)} files")
+            logger.info("Processing %d files", len(files))
+            
+            self._start_model_warm_up()
             
             # Process each file
-            results = []
-
-            for i, file_path in enumerate(files, 1):
-                logger.info(f"\n--- Processing file {i}/{len(files)}: {file_path.name} ---")
-
-                try:
-                    result = self._process_single_file(file_path)
-                    if result:
-                        results.append(result)
-
-                except Exception as e:
-                    logger.error(f"Failed to process {file_path.name}: {e}")
-                    # Create failed result
-                    failed_result = self._create_failed_result(file_path, str(e))
-                    results.append(failed_result)
-
-                # Archive processed file if requested
-                if archive_processed and input_path is None:  # Don't archive when processing single file
-                    try:
-                        # Extract report month from the result for proper archiving
-                        report_month = None
-                        if result:
-                            report_month = self._extract_report_month(result)
-
-                        self.file_handler.archive_processed_file(file_path, report_month)
-                    except Exception as e:
-                        logger.warning(f"Failed to archive {file_path.name}: {e}")
+            processing_config = self.config.get("processing", {})
+            max_workers = processing_config.get("max_workers", 4)
+            parse_processes = processing_config.get("parse_processes", 0)
+
+            if parse_processes > 0 and len(files) > 1 and BaseParser.cache_dir is not None:
+                self._prime_parse_cache(files, parse_processes)
+
+            # Detect all files up front so that LLM classification is batched
+            self._detections = None
+            if processing_config.get("batch_detection", False) and len(files) > 1:
+                detections = self.detector.detect_batch(
+                    files, processing_config.get("batch_size", 10)
+                )
+                self._detections = dict(zip(files, detections))
+
+            if processing_config.get("parallel_processing", False) and len(files) > 1 and max_workers > 1:
+                results = self._process_files_parallel(files, max_workers, input_path, archive_processed)
+            else:
+                results = []
+                for i, file_path in enumerate(files, 1):
+                    logger.info("\n--- Processing file %d/%d: %s ---", i, len(files), file_path.name)
+                    results.append(self._process_and_archive(file_path, input_path, archive_processed))
             
             # Save results
             if results:
@@ -151,7 +192,7 @@ class ReportAnalysisTool:
                 # Generate summary
                 self._print_summary(results)
 
-                logger.info(f"✅ Analysis completed. Results saved to: {output_path}")
+                logger.info("✅ Analysis completed. Results saved to: %s", output_path)
 
                 # Regenerate dashboard with new data
                 self._regenerate_dashboard()
@@ -162,9 +203,118 @@ class ReportAnalysisTool:
                 return False
                 
         except Exception as e:
-            logger.error(f"Analysis pipeline failed: {e}")
+            logger.error("Analysis pipeline failed: %s", e)
             return False
     
+    def _start_model_warm_up(self) -> None:
+        """
+        Load the LLM model in the background while the first files are parsed.
+        
+        Skipped without an LLM handler, and when the LLM cache holds unexpired
+        responses: a repeated run is then likely answered from the cache, and
+        the first cache miss loads the model on demand.
+        """
+        if self.llm_handler is None:
+            return
+        
+        if self.llm_cache is not None and self.llm_cache.has_entries():
+            logger.info("LLM cache has entries, model is loaded on the first cache miss")
+            return
+        
+        threading.Thread(target=self.llm_handler.warm_up, name="ollama-warmup", daemon=True).start()
+    
+    def _process_files_parallel(self, files: List[Path], max_workers: int,
+                                input_path: Optional[str], archive_processed: bool) -> List:
+        """
+        Process files concurrently in a thread pool.
+
+        Parsing and Ollama requests are I/O-bound, so threads overlap the
+        per-file waits. Results are returned in input order.
+
+        Args:
+            files: Files to process
+            max_workers: Maximum number of worker threads
+            input_path: Specific file path passed to run(), if any
+            archive_processed: Whether to archive processed files
+
+        Returns:
+            List of analysis results
+        """
+        logger.info("Processing %d files with %d worker threads", len(files), max_workers)
+        results = [None] * len(files)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report") as executor:
+            futures = {
+                executor.submit(self._process_and_archive, file_path, input_path, archive_processed): i
+                for i, file_path in enumerate(files)
+            }
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        return results
+
+    def _prime_parse_cache(self, files: List[Path], processes: int) -> None:
+        """
+        Parse files in worker processes ahead of the analysis.
+
+        Parsing is CPU-bound and holds the GIL, so it runs in processes; the
+        results land in the parse cache, from which detection and analysis
+        (thread-based, waiting on Ollama) then read them.
+
+        Args:
+            files: Files to parse
+            processes: Number of worker processes
+        """
+        logger.info("Pre-parsing %d files in %d processes", len(files), processes)
+
+        try:
+            with ProcessPoolExecutor(max_workers=min(processes, len(files))) as executor:
+                parsed = sum(executor.map(prime_parse_cache, files, repeat(BaseParser.cache_dir),
+                                           repeat(BaseParser.cache_ttl_hours)))
+            logger.info("Pre-parsed %d/%d files", parsed, len(files))
+        except Exception as e:
+            logger.warning("Pre-parsing failed, files will be parsed during analysis: %s", e)
+
+    def _process_and_archive(self, file_path: Path, input_path: Optional[str],
+                             archive_processed: bool):
+        """Process a single file, falling back to a failed result, and archive it."""
+        try:
+            result = self._process_single_file(file_path)
+        except Exception as e:
+            logger.error("Failed to process %s: %s", file_path.name, e)
+            # Create failed result
+            result = self._create_failed_result(
+                file_path, str(e), self.file_handler.file_stats.get(file_path)
+            )
+
+        # Archive processed file if requested
+        if archive_processed and input_path is None:  # Don't archive when processing single file
+            try:
+                # Extract report month from the result for proper archiving
+                report_month = self._extract_report_month(result)
+                self.file_handler.archive_processed_file(file_path, report_month)
+            except Exception as e:
+                logger.warning("Failed to archive %s: %s", file_path.name, e)
+
+        return result
+
+    def _get_components(self) -> Tuple[ReportDetector, ReportAnalyzer]:
+        """
+        Get the detector and analyzer for the current thread.
+
+        Parsers keep per-file state, so worker threads get their own
+        detector/analyzer instances; the main thread uses the shared ones.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.detector, self.analyzer
+
+        if not hasattr(self._thread_state, "detector"):
+            self._thread_state.detector = ReportDetector(self.config_loader, self.llm_handler)
+            self._thread_state.analyzer = ReportAnalyzer(self.llm_handler)
+
+        return self._thread_state.detector, self._thread_state.analyzer
+
     def _extract_report_month(self, result) -> Optional[str]:
         """
         Extract report month from analysis result.
@@ -175,7 +325,6 @@ class ReportAnalysisTool:
         Returns:
             Report month in format "YYYY-MM" or None
         """
-        import re
 
         # Priority 1: Check direct report_month field (for Entra devices, etc.)
         report_month = result.extracted_data.get('report_month')
@@ -193,7 +342,7 @@ class ReportAnalysisTool:
         period_start = result.extracted_data.get('period_start')
         if period_start and period_start != 'N/A':
             # Extract YYYY-MM from date like "2025-08-01"
-            match = re.match(r'(\d{4})-(\d{2})-\d{2}', str(period_start))
+            match = _ISO_DATE_RE.match(str(period_start))
             if match:
                 return f"{match.group(1)}-{match.group(2)}"
 
@@ -204,13 +353,9 @@ class ReportAnalysisTool:
 
         # Priority 4: Try to extract from filename
         filename = result.file_info.get("name", "")
-        date_patterns = [
-            r'(20\d{2})[_-]?(\d{2})',  # 2024-01 or 2024_01 or 202401
-            r'(\d{2})[_-]?(20\d{2})',  # 01-2024 or 01_2024
-        ]
 
-        for pattern in date_patterns:
-            match = re.search(pattern, filename)
+        for pattern in _FILENAME_DATE_RES:
+            match = pattern.search(filename)
             if match:
                 groups = match.groups()
                 if len(groups) == 2:
@@ -223,22 +368,29 @@ class ReportAnalysisTool:
 
     def _process_single_file(self, file_path: Path):
         """Process a single file through the complete pipeline."""
-        # Step 1: Detect report type
-        detection_result = self.detector.detect(file_path)
+        detector, analyzer = self._get_components()
+
+        # Step 1: Detect report type (unless already detected in batch)
+        if self._detections is not None and file_path in self._detections:
+            detection_result = self._detections[file_path]
+        else:
+            detection_result = detector.detect(file_path)
 
         if not detection_result:
             self.analysis_logger.log_analysis_start(file_path.name, "unknown")
-            logger.error(f"Could not detect report type for: {file_path.name}")
-            return self._create_failed_result(file_path, "Unknown report type")
+            logger.error("Could not detect report type for: %s", file_path.name)
+            return self._create_failed_result(
+                file_path, "Unknown report type", self.file_handler.file_stats.get(file_path)
+            )
 
         # Log with detected report type
         self.analysis_logger.log_analysis_start(file_path.name, detection_result.report_type)
 
-        logger.info(f"Detected as: {detection_result.report_name} "
-                   f"(confidence: {detection_result.confidence:.2f})")
+        logger.info("Detected as: %s (confidence: %.2f)",
+                    detection_result.report_name, detection_result.confidence)
 
         # Step 2: Analyze report
-        analysis_result = self.analyzer.analyze(file_path, detection_result)
+        analysis_result = analyzer.analyze(file_path, detection_result)
         
         # Log completion
         self.analysis_logger.log_analysis_complete(
@@ -247,21 +399,25 @@ class ReportAnalysisTool:
             analysis_result.processing_info.get('processing_time_seconds', 0)
         )
         
-        logger.info(f"Analysis completed - Status: {analysis_result.result_status}, "
-                   f"Score: {analysis_result.score}")
+        logger.info("Analysis completed - Status: %s, Score: %s",
+                    analysis_result.result_status, analysis_result.score)
         
         return analysis_result
     
-    def _create_failed_result(self, file_path: Path, error_message: str):
+    def _create_failed_result(self, file_path: Path, error_message: str,
+                              stat: Optional[os.stat_result] = None):
         """Create a failed analysis result."""
         from core.report_analyzer import AnalysisResult
         import time
         
+        if stat is None and file_path.exists():
+            stat = file_path.stat()
+        
         return AnalysisResult(
             file_info={
                 'name': file_path.name,
                 'path': str(file_path),
-                'size_bytes': file_path.stat().st_size if file_path.exists() else 0,
+                'size_bytes': stat.st_size if stat else 0,
                 'format': file_path.suffix[1:].lower()
             },
             report_type='unknown',
@@ -324,54 +480,66 @@ class ReportAnalysisTool:
 
     def _print_summary(self, results: List) -> None:
         """Print analysis summary to console."""
-        print("\n" + "="*60)
-        print("📊 ANALYSIS SUMMARY")
-        print("="*60)
+        # Collect the summary and write it to the console at once
+        buf = io.StringIO()
+        
+        print("\n" + "="*60, file=buf)
+        print("📊 ANALYSIS SUMMARY", file=buf)
+        print("="*60, file=buf)
+        
+        # Collect all figures in a single pass over the results
+        failed_statuses = ('nicht_erfolgreich_analysiert', 'fehler')
+        risk_counts = Counter()
+        failed_results = []
+        with_issues = []
+        score_sum = 0
+        
+        for result in results:
+            risk_counts[result.risk_level] += 1
+            score_sum += result.score
+            
+            if result.result_status in failed_statuses:
+                failed_results.append(result)
+            if (result.result_status != 'nicht_erfolgreich_analysiert'
+                    and result.analysis_details.get('issues')):
+                with_issues.append(result)
         
         total = len(results)
-        successful = sum(1 for r in results 
-                        if r.result_status not in ['nicht_erfolgreich_analysiert', 'fehler'])
-        failed = total - successful
+        failed = len(failed_results)
+        successful = total - failed
         
-        print(f"Total Files: {total}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
-        print(f"Success Rate: {(successful/total*100):.1f}%")
+        print(f"Total Files: {total}", file=buf)
+        print(f"Successful: {successful}", file=buf)
+        print(f"Failed: {failed}", file=buf)
+        print(f"Success Rate: {(successful/total*100):.1f}%", file=buf)
         
         if successful > 0:
-            avg_score = sum(r.score for r in results) / total
-            print(f"Average Score: {avg_score:.1f}/100")
+            avg_score = score_sum / total
+            print(f"Average Score: {avg_score:.1f}/100", file=buf)
         
         # Risk distribution
-        risk_counts = {}
-        for result in results:
-            risk = result.risk_level
-            risk_counts[risk] = risk_counts.get(risk, 0) + 1
-        
-        print(f"\nRisk Distribution:")
+        print(f"\nRisk Distribution:", file=buf)
         for risk, count in sorted(risk_counts.items()):
-            print(f"  {risk}: {count}")
+            print(f"  {risk}: {count}", file=buf)
         
         # Show failed files
         if failed > 0:
-            print(f"\nFailed Files:")
-            for result in results:
-                if result.result_status in ['nicht_erfolgreich_analysiert', 'fehler']:
-                    issues = '; '.join(result.analysis_details.get('issues', []))
-                    print(f"  ❌ {result.file_info['name']}: {issues}")
+            print(f"\nFailed Files:", file=buf)
+            for result in failed_results:
+                issues = '; '.join(result.analysis_details.get('issues', []))
+                print(f"  ❌ {result.file_info['name']}: {issues}", file=buf)
         
         # Show successful files with issues
-        with_issues = [r for r in results 
-                      if r.result_status not in ['nicht_erfolgreich_analysiert'] 
-                      and r.analysis_details.get('issues')]
-        
         if with_issues:
-            print(f"\nFiles with Issues:")
+            print(f"\nFiles with Issues:", file=buf)
             for result in with_issues:
                 issues = '; '.join(result.analysis_details.get('issues', [])[:2])
-                print(f"  ⚠️  {result.file_info['name']}: {issues}")
+                print(f"  ⚠️  {result.file_info['name']}: {issues}", file=buf)
+        
+        print("="*60, file=buf)
         
-        print("="*60)
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
     
     def list_report_types(self) -> None:
         """List all available report types."""
@@ -422,9 +590,17 @@ class ReportAnalysisTool:
             print("❌ LLM service not available")
             return False
     
+    def close(self) -> None:
+        """Release the connections held by the LLM handler."""
+        if self.llm_handler:
+            self.llm_handler.close()
+    
     def clear_cache(self, older_than_hours: Optional[int] = None) -> None:
-        """Clear file cache."""
+        """Clear file, parse and LLM response cache."""
         cleared = self.file_handler.clear_cache(older_than_hours)
+        cleared += BaseParser.clear_cache()
+        if self.llm_cache:
+            cleared += self.llm_cache.clear()
         print(f"🧹 Cleared {cleared} cache files")
 
 
@@ -480,11 +656,14 @@ Examples:
             return 0
         
         # Run analysis
-        success = tool.run(
-            input_path=args.file,
-            output_filename=args.output,
-            archive_processed=not args.no_archive
-        )
+        try:
+            success = tool.run(
+                input_path=args.file,
+                output_filename=args.output,
+                archive_processed=not args.no_archive
+            )
+        finally:
+            tool.close()
         
         return 0 if success else 1
         
@@ -1,13 +1,35 @@
+import importlib
+
 from parsers.base_parser import BaseParser
-from parsers.pdf_parser import PDFParser
-from parsers.excel_parser import ExcelParser
-from parsers.csv_parser import CSVParser
-from parsers.html_parser import HTMLParser
+from parsers.registry import PARSER_CLASSES, ParserMap, prime_parse_cache
+
+# Format parsers pull in pdfplumber, openpyxl, bs4 etc.; they are imported on
+# first access so that commands which never parse a file start faster
+_LAZY_IMPORTS = {
+    'PDFParser': 'parsers.pdf_parser',
+    'ExcelParser': 'parsers.excel_parser',
+    'CSVParser': 'parsers.csv_parser',
+    'HTMLParser': 'parsers.html_parser'
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'BaseParser',
     'PDFParser',
     'ExcelParser',
     'CSVParser',
-    'HTMLParser'
-]
\ No newline at end of file
+    'HTMLParser',
+    'PARSER_CLASSES',
+    'ParserMap',
+    'prime_parse_cache'
+]
@@ -1,16 +1,42 @@
 from abc import ABC, abstractmethod
+import hashlib
 import logging
+import pickle
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
+from stat import S_ISREG
+from typing import Dict, Any, Optional, Union, List, Tuple
 import pandas as pd
 from datetime import datetime
 
+from utils.file_handler import MappedFile, open_mapped
+
 logger = logging.getLogger(__name__)
 
 
 class BaseParser(ABC):
     """Abstract base class for file parsers."""
     
+    # Parser attributes set by parse() that are cached together with its result
+    CACHED_STATE: Tuple[str, ...] = ()
+    
+    # Whether parse() accepts the file content as a fileobj argument
+    ACCEPTS_FILEOBJ = False
+    
+    # Directory for cached parse results and extracted text (None = disabled)
+    cache_dir: Optional[Path] = None
+    
+    # Hours after which cached results are discarded (None = never)
+    cache_ttl_hours: Optional[float] = None
+    
+    # Part of the cache key; bump when parse or extract_text output changes so
+    # results cached by an older parser version are not served anymore
+    CACHE_VERSION = 2
+    
+    # File content hashes by (path, mtime_ns, size), so unchanged files are hashed once
+    _file_digests: Dict[Tuple[str, int, int], str] = {}
+    _digest_lock = threading.Lock()
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialize BaseParser.
@@ -83,16 +109,19 @@ class BaseParser(ABC):
         Returns:
             True if file is valid, False otherwise
         """
-        if not file_path.exists():
+        # One stat call instead of separate exists/size/is_file checks
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             logger.error(f"File does not exist: {file_path}")
             return False
         
-        if file_path.stat().st_size == 0:
-            logger.error(f"File is empty: {file_path}")
+        if not S_ISREG(stat.st_mode):
+            logger.error(f"Path is not a file: {file_path}")
             return False
         
-        if not file_path.is_file():
-            logger.error(f"Path is not a file: {file_path}")
+        if stat.st_size == 0:
+            logger.error(f"File is empty: {file_path}")
             return False
         
         return True
@@ -126,14 +155,14 @@ class BaseParser(ABC):
         if df is None or df.empty:
             return {"sample": [], "row_count": 0, "column_count": 0}
         
-        sample = df.head(rows).to_dict(orient='records')
+        row_count, column_count = df.shape
         
         return {
-            "sample": sample,
-            "row_count": len(df),
-            "column_count": len(df.columns),
-            "columns": list(df.columns),
-            "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+            "sample": df.iloc[:rows].to_dict('records'),
+            "row_count": row_count,
+            "column_count": column_count,
+            "columns": df.columns.tolist(),
+            "dtypes": df.dtypes.astype(str).to_dict()
         }
     
     def clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -149,25 +178,38 @@ class BaseParser(ABC):
         if df is None or df.empty:
             return df
         
-        # Remove completely empty rows
-        df = df.dropna(how='all')
-        
-        # Remove completely empty columns
-        df = df.dropna(axis=1, how='all')
-        
-        # Strip whitespace from string columns
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = df[col].str.strip()
-                except (AttributeError, TypeError):
-                    pass
-        
-        # Reset index
-        df = df.reset_index(drop=True)
+        # Remove completely empty rows and columns; a single NA-mask check
+        # avoids copying frames that have none (the usual case)
+        not_na = df.notna()
+        rows_dropped = not not_na.any(axis=1).all()
+        cols_dropped = not not_na.any(axis=0).all()
+        if rows_dropped:
+            df = df.dropna(how='all')
+        if cols_dropped:
+            df = df.dropna(axis=1, how='all')
+        # Shallow copy so the caller's frame is left untouched below; pandas
+        # flags dropna results as slices of it, so they need one as well
+        df = df.copy(deep=False)
+        
+        # Strip whitespace from string columns in one pass
+        obj_cols = df.select_dtypes(include='object').columns
+        if len(obj_cols):
+            df[obj_cols] = df[obj_cols].apply(self._strip_strings)
+        
+        # Reset index if rows were dropped or the index is not the default one
+        if rows_dropped or not df.index.equals(pd.RangeIndex(len(df))):
+            df = df.reset_index(drop=True)
         
         return df
     
+    @staticmethod
+    def _strip_strings(series: pd.Series) -> pd.Series:
+        """Strip surrounding whitespace from a string column."""
+        try:
+            return series.str.strip()
+        except (AttributeError, TypeError):
+            return series
+    
     def detect_date_columns(self, df: pd.DataFrame) -> List[str]:
         """
         Detect columns that likely contain date values.
@@ -188,16 +230,18 @@ class BaseParser(ABC):
                 date_columns.append(col)
                 continue
             
-            # Try to parse as date
-            if df[col].dtype == 'object':
-                try:
-                    pd.to_datetime(df[col].dropna().head(10), errors='coerce')
-                    non_null_parsed = pd.to_datetime(df[col].dropna().head(10), 
-                                                    errors='coerce').notna().sum()
-                    if non_null_parsed >= 5:  # At least half should parse as dates
-                        date_columns.append(col)
-                except Exception:
-                    pass
+            # Only string columns need a parse attempt
+            if not pd.api.types.is_object_dtype(df[col]):
+                continue
+            
+            # Try to parse as date (format='mixed' skips per-sample format inference)
+            try:
+                parsed = pd.to_datetime(df[col].dropna().head(10), errors='coerce',
+                                        format='mixed')
+                if parsed.notna().sum() >= 5:  # At least half should parse as dates
+                    date_columns.append(col)
+            except Exception:
+                pass
         
         return date_columns
     
@@ -205,6 +249,8 @@ class BaseParser(ABC):
         """
         Convert date columns to datetime objects.
         
+        Not applied by safe_parse; call it explicitly where converted dates are needed.
+        
         Args:
             df: DataFrame with date columns
             date_columns: List of columns to convert (auto-detect if None)
@@ -232,6 +278,9 @@ class BaseParser(ABC):
         """
         Safely parse file with error handling.
         
+        Results are served from the parse cache if it is enabled and the
+        file content has not changed.
+        
         Args:
             file_path: Path to the file to parse
             
@@ -242,11 +291,23 @@ class BaseParser(ABC):
             if not self.validate_file(file_path):
                 return None
             
-            df = self.parse(file_path)
+            # The file is read once: the mapping serves both hashing and parsing,
+            # parsers read from it directly instead of a heap copy
+            with open_mapped(file_path) as data:
+                cache_path = self._get_cache_path(file_path, "parse.pkl", data)
+                df = self._load_cached_parse(cache_path)
+                
+                if df is None:
+                    if self.ACCEPTS_FILEOBJ:
+                        df = self.parse(file_path, fileobj=MappedFile(data))
+                    else:
+                        df = self.parse(file_path)
+                    
+                    if df is not None:
+                        df = self.clean_dataframe(df)
+                        self._store_cached_parse(cache_path, df)
             
             if df is not None:
-                df = self.clean_dataframe(df)
-                df = self.convert_dates(df)
                 self.get_metadata(file_path)
             
             return df
@@ -255,12 +316,183 @@ class BaseParser(ABC):
             logger.error(f"Failed to parse {file_path}: {e}")
             return None
     
-    def get_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def cached_extract_text(self, file_path: Path, max_chars: int = 50000) -> str:
+        """
+        Extract text content, using the parse cache if it is enabled.
+        
+        Args:
+            file_path: Path to the file
+            max_chars: Maximum number of characters to extract
+            
+        Returns:
+            Extracted text content
+        """
+        cache_path = self._get_cache_path(file_path, f"text_{max_chars}.txt")
+        
+        if self._is_cache_valid(cache_path):
+            try:
+                return cache_path.read_text(encoding='utf-8')
+            except Exception as e:
+                logger.warning(f"Failed to read cached text for {file_path.name}: {e}")
+        
+        text = self.extract_text(file_path, max_chars=max_chars)
+        
+        if cache_path is not None and text:
+            try:
+                self._write_cache_file(cache_path, text.encode('utf-8'))
+            except Exception as e:
+                logger.warning(f"Failed to cache text for {file_path.name}: {e}")
+        
+        return text
+    
+    @classmethod
+    def enable_cache(cls, cache_dir: Path, ttl_hours: Optional[float] = None) -> None:
+        """
+        Enable caching of parse results and extracted text for all parsers.
+        
+        Args:
+            cache_dir: Directory to store cached results in
+            ttl_hours: Hours after which cached results expire (None = never)
+        """
+        BaseParser.cache_dir = Path(cache_dir)
+        BaseParser.cache_ttl_hours = ttl_hours
+        BaseParser.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @classmethod
+    def clear_cache(cls) -> int:
+        """
+        Remove all cached parse results and extracted text.
+        
+        Returns:
+            Number of files removed
+        """
+        if BaseParser.cache_dir is None or not BaseParser.cache_dir.exists():
+            return 0
+        
+        cleared = 0
+        
+        for cache_file in BaseParser.cache_dir.glob("*/*"):
+            try:
+                cache_file.unlink()
+                cleared += 1
+            except Exception as e:
+                logger.warning(f"Failed to clear parse cache file {cache_file}: {e}")
+        
+        return cleared
+    
+    def _get_cache_path(self, file_path: Path, name: str,
+                        data: Optional[bytes] = None) -> Optional[Path]:
+        """Return the cache file for this parser and file content, or None if disabled."""
+        if BaseParser.cache_dir is None:
+            return None
+        
+        try:
+            digest = self._get_file_digest(file_path, data)
+        except OSError as e:
+            logger.warning(f"Failed to hash {file_path.name} for parse cache: {e}")
+            return None
+        
+        return BaseParser.cache_dir / self.__class__.__name__ / f"{digest}_v{self.CACHE_VERSION}_{name}"
+    
+    def _is_cache_valid(self, cache_path: Optional[Path]) -> bool:
+        """Check that a cache file exists and has not expired; expired files are removed."""
+        if cache_path is None:
+            return False
+        
+        try:
+            cache_mtime = cache_path.stat().st_mtime
+        except OSError:
+            return False
+        
+        if BaseParser.cache_ttl_hours is not None:
+            cache_age_hours = (datetime.now() - datetime.fromtimestamp(cache_mtime)).total_seconds() / 3600
+            
+            if cache_age_hours > BaseParser.cache_ttl_hours:
+                logger.debug(f"Parse cache expired: {cache_path.name}")
+                try:
+                    cache_path.unlink()
+                except OSError as e:
+                    logger.warning(f"Failed to remove expired parse cache file {cache_path}: {e}")
+                return False
+        
+        return True
+    
+    def _get_file_digest(self, file_path: Path, data: Optional[bytes] = None) -> str:
+        """Calculate the SHA256 hash of a file, reusing it while the file is unchanged."""
+        stat = file_path.stat()
+        stat_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        
+        with BaseParser._digest_lock:
+            digest = BaseParser._file_digests.get(stat_key)
+        
+        if digest is None:
+            if data is not None:
+                digest = hashlib.sha256(data).hexdigest()
+            else:
+                sha256_hash = hashlib.sha256()
+                with open(file_path, 'rb') as f:
+                    for byte_block in iter(lambda: f.read(1024 * 1024), b""):
+                        sha256_hash.update(byte_block)
+                digest = sha256_hash.hexdigest()
+            
+            with BaseParser._digest_lock:
+                BaseParser._file_digests[stat_key] = digest
+        
+        return digest
+    
+    def _load_cached_parse(self, cache_path: Optional[Path]) -> Optional[pd.DataFrame]:
+        """Load a cached parse result and restore the parser state stored with it."""
+        if not self._is_cache_valid(cache_path):
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            
+            self._restore_state(cached["state"])
+            logger.debug(f"Using cached parse result: {cache_path.name}")
+            return cached["df"]
+            
+        except Exception as e:
+            logger.warning(f"Failed to read cached parse result {cache_path}: {e}")
+            return None
+    
+    def _store_cached_parse(self, cache_path: Optional[Path], df: pd.DataFrame) -> None:
+        """Store a parse result together with the parser state set by parse()."""
+        if cache_path is None:
+            return
+        
+        try:
+            cached = {
+                "df": df,
+                "state": {name: getattr(self, name, None) for name in self.CACHED_STATE}
+            }
+            self._write_cache_file(
+                cache_path, pickle.dumps(cached, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache parse result {cache_path}: {e}")
+    
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore parser attributes from a cached parse result."""
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @staticmethod
+    def _write_cache_file(cache_path: Path, data: bytes) -> None:
+        """Write a cache file atomically."""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(cache_path)
+    
+    def get_summary_stats(self, df: pd.DataFrame, deep: bool = False) -> Dict[str, Any]:
         """
         Get summary statistics for DataFrame.
         
         Args:
             df: DataFrame to analyze
+            deep: Measure memory of object cells individually (slow on large frames)
             
         Returns:
             Dictionary containing summary statistics
@@ -271,21 +503,15 @@ class BaseParser(ABC):
         stats = {
             "row_count": len(df),
             "column_count": len(df.columns),
-            "memory_usage_bytes": df.memory_usage(deep=True).sum(),
+            "memory_usage_bytes": int(df.memory_usage(deep=deep).sum()),
             "null_counts": df.isnull().sum().to_dict(),
             "duplicate_rows": df.duplicated().sum()
         }
         
-        # Add numeric column statistics
+        # Add numeric column statistics (all reductions in a single agg call)
         numeric_cols = df.select_dtypes(include=['number']).columns
         if len(numeric_cols) > 0:
-            stats["numeric_stats"] = {}
-            for col in numeric_cols:
-                stats["numeric_stats"][col] = {
-                    "mean": float(df[col].mean()) if pd.notna(df[col].mean()) else None,
-                    "min": float(df[col].min()) if pd.notna(df[col].min()) else None,
-                    "max": float(df[col].max()) if pd.notna(df[col].max()) else None,
-                    "std": float(df[col].std()) if pd.notna(df[col].std()) else None
-                }
+            agg = df[numeric_cols].agg(['mean', 'min', 'max', 'std']).astype(float)
+            stats["numeric_stats"] = agg.astype(object).where(agg.notna(), None).to_dict()
         
         return stats
\ No newline at end of file
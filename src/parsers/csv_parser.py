@@ -1,17 +1,50 @@
-import logging
+import codecs
+import copy
 import csv
+import logging
+import io
+import operator
+import re
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
 import pandas as pd
-import chardet
 from parsers.base_parser import BaseParser
+from utils.file_handler import open_mapped
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 logger = logging.getLogger(__name__)
 
+# Bytes read from the start of a file for encoding, delimiter and header sniffing
+SNIFF_BYTES = 65536
+# Bytes decoded for delimiter and header detection
+SNIFF_SAMPLE_BYTES = 8192
+# Sample size for chardet, which is only used for files that are neither ASCII nor UTF-8
+CHARDET_SAMPLE_BYTES = 4096
+# Rows read by extract_text (sample rows and numeric statistics)
+EXTRACT_TEXT_MAX_ROWS = 50000
+# Files above this size are read in chunks of CHUNK_ROWS rows
+CHUNKED_PARSE_BYTES = 256 * 1024 ** 2
+CHUNK_ROWS = 500000
+# Lines checked for a consistent delimiter count
+DELIMITER_SAMPLE_LINES = 10
+# Quoted fields, which may contain delimiters
+_QUOTED_RE = re.compile(r'"[^"]*"')
+# Column names that suggest date values
+_DATE_COLUMN_RE = re.compile(r'date|datum|time|zeit', re.IGNORECASE)
+
 
 class CSVParser(BaseParser):
     """Parser for CSV files."""
     
+    CACHED_STATE = ('detected_encoding', 'delimiter')
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialize CSVParser.
@@ -22,9 +55,14 @@ class CSVParser(BaseParser):
         super().__init__(encoding)
         self.delimiter: Optional[str] = None
         self.detected_encoding: Optional[str] = None
+        # Last full parse result (a reference, not a copy), reused by extract_text
+        # and get_metadata until get_metadata is done with the file
+        self._last_parse: Optional[Tuple[tuple, pd.DataFrame, Optional[str], Optional[str]]] = None
+        # Last deep metadata, so repeated get_metadata calls do not parse again
+        self._last_metadata: Optional[Tuple[tuple, Dict[str, Any]]] = None
     
     def parse(self, file_path: Path, delimiter: Optional[str] = None,
-             encoding: Optional[str] = None) -> pd.DataFrame:
+             encoding: Optional[str] = None, nrows: Optional[int] = None) -> pd.DataFrame:
         """
         Parse CSV file and return DataFrame.
 
@@ -32,6 +70,7 @@ class CSVParser(BaseParser):
             file_path: Path to the CSV file
             delimiter: CSV delimiter (auto-detect if None)
             encoding: File encoding (auto-detect if None)
+            nrows: Only read this many data rows (whole file if None)
 
         Returns:
             DataFrame containing CSV data
@@ -44,22 +83,25 @@ class CSVParser(BaseParser):
             return pd.DataFrame()
 
         try:
+            # Both detectors work on the same head of the file
+            head = self._read_head(file_path) if not (encoding and delimiter) else b""
+
             # Detect encoding if not provided
             if not encoding:
                 logger.info("Detecting encoding...")
-                encoding = self._detect_encoding(file_path)
+                encoding = self._detect_encoding(head)
                 self.detected_encoding = encoding
                 logger.info(f"Detected encoding: {encoding}")
 
             # Detect delimiter if not provided
             if not delimiter:
                 logger.info("Detecting delimiter...")
-                delimiter = self._detect_delimiter(file_path, encoding)
+                delimiter = self._detect_delimiter(head, encoding)
                 self.delimiter = delimiter
                 logger.info(f"Detected delimiter: {repr(delimiter)}")
 
             # Try to parse CSV with various strategies
-            df = self._parse_with_fallback(file_path, delimiter, encoding)
+            df = self._parse_with_fallback(file_path, delimiter, encoding, nrows)
             
             if df is not None and not df.empty:
                 # Clean the DataFrame
@@ -69,6 +111,8 @@ class CSVParser(BaseParser):
                 df = self._infer_dtypes(df)
                 
                 logger.info(f"Successfully parsed CSV: {len(df)} rows, {len(df.columns)} columns")
+                if nrows is None and delimiter is None and encoding is None:
+                    self._last_parse = (self._file_key(file_path), df, self.delimiter, self.detected_encoding)
                 return df
             
             return pd.DataFrame()
@@ -77,34 +121,79 @@ class CSVParser(BaseParser):
             logger.error(f"Failed to parse CSV file {file_path}: {e}")
             return pd.DataFrame()
     
-    def _detect_encoding(self, file_path: Path) -> str:
+    def _read_head(self, file_path: Path, size: int = SNIFF_BYTES) -> bytes:
         """
-        Detect file encoding using chardet.
+        Read the first bytes of a file in a single memory-mapped access.
 
         Args:
             file_path: Path to the CSV file
+            size: Maximum number of bytes to read
+
+        Returns:
+            Head of the file (empty if it cannot be read)
+        """
+        try:
+            with open_mapped(file_path) as data:
+                return bytes(data[:size])
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read head of {file_path.name}: {e}")
+            return b""
+    
+    @staticmethod
+    def _decode_sample(raw_data: bytes, encoding: str) -> str:
+        """
+        Decode the start of the head like a text-mode open() would.
+
+        Only the first SNIFF_SAMPLE_BYTES are decoded, with universal newlines;
+        a character cut off at the end is dropped.
+
+        Args:
+            raw_data: Head of the CSV file
+            encoding: File encoding to use
+
+        Returns:
+            Decoded sample
+        """
+        text = raw_data[:SNIFF_SAMPLE_BYTES].decode(encoding, errors='ignore')
+        return io.StringIO(text, newline=None).read()
+    
+    def _detect_encoding(self, raw_data: bytes) -> str:
+        """
+        Detect file encoding, using chardet only if the head is neither ASCII nor UTF-8.
+
+        Args:
+            raw_data: Head of the CSV file
 
         Returns:
             Detected encoding
         """
         try:
-            with open(file_path, 'rb') as f:
-                # Read first 10KB for detection
-                raw_data = f.read(10000)
+            # Check for UTF-8 BOM
+            if raw_data.startswith(b'\xef\xbb\xbf'):
+                logger.info("Detected UTF-8 BOM, using utf-8-sig encoding")
+                return 'utf-8-sig'
 
-                # Check for UTF-8 BOM
-                if raw_data.startswith(b'\xef\xbb\xbf'):
-                    logger.info("Detected UTF-8 BOM, using utf-8-sig encoding")
-                    return 'utf-8-sig'
+            # Plain ASCII (read as latin-1, like chardet's ascii result below)
+            if raw_data.isascii():
+                return 'latin-1'
 
-                result = chardet.detect(raw_data)
+            # Valid UTF-8; a multi-byte character cut off at the end of the head is fine
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(raw_data, final=False)
+                return 'utf-8'
+            except UnicodeDecodeError:
+                pass
 
-                if result['confidence'] > 0.7:
-                    detected = result['encoding']
-                    # Handle common encoding aliases
-                    if detected.lower() in ['ascii', 'iso-8859-1']:
-                        return 'latin-1'
-                    return detected
+            # chardet is only needed (and imported) for other encodings; 4KB are enough for it
+            import chardet
+            result = chardet.detect(raw_data[:CHARDET_SAMPLE_BYTES])
+
+            if result['confidence'] > 0.7:
+                detected = result['encoding']
+                # Handle common encoding aliases
+                if detected.lower() in ['ascii', 'iso-8859-1']:
+                    return 'latin-1'
+                return detected
 
         except Exception as e:
             logger.debug(f"Encoding detection failed: {e}")
@@ -112,116 +201,146 @@ class CSVParser(BaseParser):
         # Default fallback chain
         return 'utf-8'
     
-    def _detect_delimiter(self, file_path: Path, encoding: str) -> str:
+    def _detect_delimiter(self, raw_data: bytes, encoding: str) -> str:
         """
-        Detect CSV delimiter using csv.Sniffer.
+        Detect CSV delimiter from its per-line counts in the head of the file.
+
+        A delimiter is accepted if it occurs equally often (and at least once)
+        in each of the first lines, ignoring quoted text; the earlier entry of
+        the common delimiters wins if several qualify.
 
         Args:
-            file_path: Path to the CSV file
+            raw_data: Head of the CSV file
             encoding: File encoding to use
 
         Returns:
             Detected delimiter
         """
-        # List of common delimiters to validate against
+        # List of common delimiters, in order of preference
         common_delimiters = [',', ';', '\t', '|', ':']
 
         try:
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                # Read sample for detection
-                sample = f.read(8192)
-                sniffer = csv.Sniffer()
-                delimiter = sniffer.sniff(sample).delimiter
-
-                # Validate that Sniffer found a common delimiter
-                if delimiter in common_delimiters:
-                    logger.info(f"Sniffer detected valid delimiter: {repr(delimiter)}")
-                    return delimiter
-                else:
-                    logger.info(f"Sniffer detected unusual delimiter {repr(delimiter)}, using fallback method")
-
-        except Exception as e:
-            logger.info(f"Delimiter detection with Sniffer failed: {e}, using fallback method")
-
-        # Fallback: Count common delimiters in first line
-        try:
-            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-                first_line = f.readline()
-
-                # Count occurrences of each delimiter
-                delimiter_counts = {}
-                for delim in common_delimiters:
-                    delimiter_counts[delim] = first_line.count(delim)
-
-                logger.info(f"Delimiter counts in first line: {delimiter_counts}")
-
-                # Return delimiter with highest count
-                if delimiter_counts:
-                    best_delimiter = max(delimiter_counts, key=delimiter_counts.get)
-                    if delimiter_counts[best_delimiter] > 0:
-                        logger.info(f"Selected delimiter: {repr(best_delimiter)} (count: {delimiter_counts[best_delimiter]})")
-                        return best_delimiter
-
-        except Exception as e:
-            logger.warning(f"Fallback delimiter detection failed: {e}")
+            sample = self._decode_sample(raw_data, encoding)
+        except LookupError as e:
+            logger.warning(f"Unknown encoding {encoding}, using default delimiter: {e}")
+            return ','
+
+        raw_lines = sample.split('\n')
+        if len(raw_lines) > 1:
+            raw_lines.pop()  # Last line may be cut off or empty
+        lines = [_QUOTED_RE.sub('', line) for line in raw_lines[:DELIMITER_SAMPLE_LINES] if line]
+
+        for delim in common_delimiters:
+            counts = {line.count(delim) for line in lines}
+            if len(counts) == 1 and counts.pop() > 0:
+                logger.info(f"Detected delimiter: {repr(delim)} (consistent across {len(lines)} lines)")
+                return delim
+
+        logger.info("No delimiter is consistent across lines, using fallback method")
+
+        # Fallback: Most frequent common delimiter in first line
+        first_line = raw_lines[0]
+        best_delimiter = max(common_delimiters, key=first_line.count)
+        if first_line.count(best_delimiter):
+            logger.info(f"Selected delimiter: {repr(best_delimiter)} (count: {first_line.count(best_delimiter)})")
+            return best_delimiter
 
         # Default to comma
         logger.info("Using default delimiter: comma")
         return ','
     
     def _parse_with_fallback(self, file_path: Path, delimiter: str,
-                           encoding: str) -> Optional[pd.DataFrame]:
+                           encoding: str, nrows: Optional[int] = None) -> Optional[pd.DataFrame]:
         """
-        Parse CSV with multiple fallback strategies.
+        Parse CSV, falling back only on the specific error encountered.
+
+        If pyarrow is installed, its multithreaded reader is tried first
+        (it cannot limit the number of rows or read in chunks, so not for
+        partial reads or files larger than CHUNKED_PARSE_BYTES).
+        Otherwise (or if it fails) the C engine is used, skipping malformed
+        lines. A UnicodeDecodeError retries with latin-1, a ParserError
+        retries with the more tolerant Python engine. Files larger than
+        CHUNKED_PARSE_BYTES are read in chunks of CHUNK_ROWS rows, which
+        bounds the tokenizer's memory to one chunk.
 
         Args:
             file_path: Path to the CSV file
             delimiter: CSV delimiter
             encoding: File encoding
+            nrows: Only read this many data rows (whole file if None)
 
         Returns:
-            DataFrame or None if all strategies fail
+            DataFrame or None if parsing fails
         """
         logger.info(f"Starting CSV parsing with delimiter={repr(delimiter)}, encoding={encoding}")
 
-        strategies = [
-            # Strategy 1: Standard parsing
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding=encoding),
-
-            # Strategy 2: With error handling
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding=encoding,
-                              on_bad_lines='skip'),
+        chunked = nrows is None and file_path.stat().st_size > CHUNKED_PARSE_BYTES
 
-            # Strategy 3: Different encoding
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding='latin-1',
-                              on_bad_lines='skip'),
+        # pyarrow builds the whole table before converting it, so large files
+        # go to the chunked reader instead
+        df = None
+        if HAS_PYARROW and nrows is None and not chunked:
+            df = self._read_with_pyarrow(file_path, delimiter, encoding)
 
-            # Strategy 4: No header
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding=encoding,
-                              header=None, on_bad_lines='skip'),
+        engine = 'c'
+        while df is None:
+            try:
+                logger.info(f"Reading CSV with {engine} engine and {encoding} encoding"
+                            f"{' in chunks' if chunked else ''}...")
+                result = pd.read_csv(file_path, sep=delimiter, encoding=encoding,
+                                     on_bad_lines='skip', quotechar='"', engine=engine, nrows=nrows,
+                                     chunksize=CHUNK_ROWS if chunked else None,
+                                     **({'low_memory': False} if engine == 'c' else {}))
+                if chunked:
+                    with result as reader:
+                        df = pd.concat(reader, ignore_index=True)
+                else:
+                    df = result
+            except UnicodeDecodeError as e:
+                if encoding == 'latin-1':
+                    logger.error(f"CSV parsing failed: {e}")
+                    return None
+                logger.info(f"✗ Decoding failed ({e}), retrying with latin-1")
+                encoding = 'latin-1'
+            except pd.errors.ParserError as e:
+                if engine == 'python':
+                    logger.error(f"CSV parsing failed: {e}")
+                    return None
+                logger.info(f"✗ C engine failed ({e}), retrying with python engine")
+                engine = 'python'
+            except Exception as e:
+                logger.error(f"CSV parsing failed: {e}")
+                return None
 
-            # Strategy 5: Different quote character
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding=encoding,
-                              quotechar='"', on_bad_lines='skip'),
+        if df is None or df.empty:
+            logger.error("CSV parsing produced no data")
+            return None
 
-            # Strategy 6: Python engine (slower but more flexible)
-            lambda: pd.read_csv(file_path, sep=delimiter, encoding=encoding,
-                              engine='python', on_bad_lines='skip')
-        ]
+        logger.info(f"✓ Parsed CSV: {len(df)} rows, {len(df.columns)} columns")
+        logger.info(f"Column names: {list(df.columns)[:5]}..." if len(df.columns) > 5 else f"Column names: {list(df.columns)}")
+        return df
+    
+    def _read_with_pyarrow(self, file_path: Path, delimiter: str,
+                          encoding: str) -> Optional[pd.DataFrame]:
+        """
+        Read CSV with the pyarrow engine.
 
-        for i, strategy in enumerate(strategies, 1):
-            try:
-                logger.info(f"Trying strategy {i}...")
-                df = strategy()
-                if df is not None and not df.empty:
-                    logger.info(f"✓ Strategy {i} succeeded: {len(df)} rows, {len(df.columns)} columns")
-                    logger.info(f"Column names: {list(df.columns)[:5]}..." if len(df.columns) > 5 else f"Column names: {list(df.columns)}")
-                    return df
-            except Exception as e:
-                logger.info(f"✗ Strategy {i} failed: {e}")
-                continue
+        Args:
+            file_path: Path to the CSV file
+            delimiter: CSV delimiter
+            encoding: File encoding
 
-        logger.error("All parsing strategies failed")
+        Returns:
+            DataFrame or None if pyarrow could not read the file
+        """
+        try:
+            logger.info(f"Reading CSV with pyarrow engine and {encoding} encoding...")
+            df = pd.read_csv(file_path, sep=delimiter, encoding=encoding,
+                             on_bad_lines='skip', quotechar='"', engine='pyarrow')
+            if not df.empty:
+                return df
+        except Exception as e:
+            logger.info(f"✗ pyarrow engine failed ({e}), falling back to C engine")
         return None
     
     def _infer_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -234,38 +353,47 @@ class CSVParser(BaseParser):
         Returns:
             DataFrame with inferred types
         """
-        for col in df.columns:
-            # Skip if already numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
+        # Only text columns are candidates (by position, so duplicate names work);
+        # columns the reader already typed (e.g. pyarrow timestamps) are kept
+        positions = [i for i, dtype in enumerate(df.dtypes)
+                     if pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.StringDtype)]
+        if not positions:
+            return df
+        
+        # Convert all candidates to numeric at once
+        numeric = df.iloc[:, positions].apply(self._to_numeric)
+        
+        # If more than 50% converted successfully, use numeric
+        use_numeric = (numeric.notna().sum() > len(df) * 0.5).to_numpy()
+        
+        for i, pos in enumerate(positions):
+            if use_numeric[i]:
+                df.isetitem(pos, numeric.iloc[:, i])
                 continue
             
-            # Try to convert to numeric
-            try:
-                # Remove common formatting characters
-                cleaned = df[col].astype(str).str.replace(',', '').str.replace(' ', '')
-                numeric = pd.to_numeric(cleaned, errors='coerce')
-                
-                # If more than 50% converted successfully, use numeric
-                if numeric.notna().sum() > len(df) * 0.5:
-                    df[col] = numeric
-                    continue
-            except Exception:
-                pass
-            
             # Try to convert to datetime
             try:
-                if any(keyword in str(col).lower() 
-                      for keyword in ['date', 'datum', 'time', 'zeit']):
-                    datetime_col = pd.to_datetime(df[col], errors='coerce')
+                if _DATE_COLUMN_RE.search(str(df.columns[pos])):
+                    datetime_col = pd.to_datetime(df.iloc[:, pos], errors='coerce')
                     
                     # If more than 50% converted successfully, use datetime
                     if datetime_col.notna().sum() > len(df) * 0.5:
-                        df[col] = datetime_col
+                        df.isetitem(pos, datetime_col)
             except Exception:
                 pass
         
         return df
     
+    @staticmethod
+    def _to_numeric(series: pd.Series) -> pd.Series:
+        """Convert a column to numeric, ignoring spaces and thousands separators."""
+        try:
+            # Remove common formatting characters in a single pass
+            cleaned = series.astype(str).str.replace(r'[ ,]', '', regex=True)
+            return pd.to_numeric(cleaned, errors='coerce')
+        except Exception:
+            return pd.Series(index=series.index, dtype=float)
+    
     def extract_text(self, file_path: Path, max_chars: int = 50000) -> str:
         """
         Extract text content from CSV for LLM processing.
@@ -281,8 +409,9 @@ class CSVParser(BaseParser):
             return ""
         
         try:
-            # Parse if not already done
-            df = self.parse(file_path)
+            # Only the start of large files is read; row count and statistics
+            # are then based on that sample
+            df = self._get_parsed(file_path, nrows=EXTRACT_TEXT_MAX_ROWS)
             
             if df.empty:
                 return ""
@@ -292,21 +421,23 @@ class CSVParser(BaseParser):
             # Add header information
             text_parts.append(f"CSV File: {file_path.name}")
             text_parts.append(f"Columns ({len(df.columns)}): {', '.join(df.columns.astype(str))}")
-            text_parts.append(f"Rows: {len(df)}")
+            if len(df) < EXTRACT_TEXT_MAX_ROWS:
+                text_parts.append(f"Rows: {len(df)}")
+            else:
+                text_parts.append(f"Rows: {len(df)}+ (statistics based on the first {len(df)} rows)")
             text_parts.append("")
             
             # Add sample data
             sample_size = min(100, len(df))
             text_parts.append(f"First {sample_size} rows:")
             
-            for idx, row in df.head(sample_size).iterrows():
-                row_text = " | ".join(f"{col}: {val}" for col, val in row.items())
-                text_parts.append(f"Row {idx + 1}: {row_text}")
-                
-                # Check size limit
-                current_text = "\n".join(text_parts)
-                if len(current_text) >= max_chars:
-                    break
+            row_lines = self._format_rows(df.head(sample_size))
+            
+            # Stop after the row that reaches the size limit
+            text_length = len("\n".join(text_parts))
+            lengths = np.cumsum([len(line) + 1 for line in row_lines]) + text_length
+            row_count = int(np.searchsorted(lengths, max_chars)) + 1
+            text_parts.extend(row_lines[:row_count])
             
             # Add summary statistics for numeric columns
             numeric_cols = df.select_dtypes(include=['number']).columns
@@ -323,16 +454,51 @@ class CSVParser(BaseParser):
             logger.error(f"Failed to extract text from CSV: {e}")
             return ""
     
-    def get_metadata(self, file_path: Path) -> Dict[str, Any]:
+    @staticmethod
+    def _format_rows(df: pd.DataFrame) -> List[str]:
+        """
+        Format rows as 'Row n: column: value | ...' lines.
+        
+        Values come from the row-wise (interleaved) array, so they render
+        exactly as they would when iterating over the rows. The column
+        prefixes are built once for all rows.
+        
+        Args:
+            df: Rows to format
+            
+        Returns:
+            One line per row
+        """
+        values = df.to_numpy()
+        if values.dtype.kind in 'mM':
+            values = df.to_numpy(dtype=object)
+        
+        # Row iteration yields Python scalars, as tolist() does
+        values = values.tolist()
+        
+        prefixes = [f"{col}: " for col in df.columns]
+        return [f"Row {idx + 1}: " + " | ".join(map(operator.add, prefixes, map(str, row)))
+                for idx, row in zip(df.index, values)]
+    
+    def get_metadata(self, file_path: Path, deep: bool = True) -> Dict[str, Any]:
         """
         Extract metadata from CSV file.
         
         Args:
             file_path: Path to the CSV file
+            deep: Parse the file for data statistics; if False, only the
+                encoding, delimiter and header row are read
             
         Returns:
             Dictionary containing CSV metadata
         """
+        if not deep:
+            return self._get_structure_metadata(file_path, super().get_metadata(file_path))
+        
+        file_key = self._file_key(file_path)
+        if self._last_metadata is not None and self._last_metadata[0] == file_key:
+            return copy.deepcopy(self._last_metadata[1])
+        
         metadata = super().get_metadata(file_path)
         
         try:
@@ -344,7 +510,7 @@ class CSVParser(BaseParser):
             })
             
             # Parse to get data statistics
-            df = self.parse(file_path)
+            df = self._get_parsed(file_path)
             
             if not df.empty:
                 metadata.update({
@@ -352,7 +518,7 @@ class CSVParser(BaseParser):
                     "column_count": len(df.columns),
                     "columns": list(df.columns),
                     "has_header": self._has_header(file_path),
-                    "memory_usage_bytes": df.memory_usage(deep=True).sum(),
+                    "memory_usage_bytes": int(df.memory_usage(deep=False).sum()),
                     "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
                 })
                 
@@ -370,13 +536,76 @@ class CSVParser(BaseParser):
                     issues.append(f"Found duplicate column names: {duplicate_cols}")
                 
                 # Check for high null percentage
-                null_percentages = (df.isnull().sum() / len(df) * 100)
-                high_null_cols = null_percentages[null_percentages > 50].index.tolist()
+                null_counts = df.isna().sum()
+                high_null_cols = null_counts[null_counts > len(df) * 0.5].index.tolist()
                 if high_null_cols:
                     issues.append(f"Columns with >50% null values: {high_null_cols}")
                 
                 if issues:
                     metadata["data_issues"] = issues
+                
+                self._last_metadata = (file_key, copy.deepcopy(metadata))
+            
+        except Exception as e:
+            logger.debug(f"Could not extract CSV metadata: {e}")
+        
+        # The file is done; do not keep its frame alive
+        self._last_parse = None
+        
+        return metadata
+    
+    def _get_parsed(self, file_path: Path, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Return the last full parse of an unchanged file, or parse it.
+        
+        The frame is shared with the caller of parse, so it must only be read.
+        
+        Args:
+            file_path: Path to the CSV file
+            nrows: Only this many data rows are needed (all if None)
+            
+        Returns:
+            DataFrame containing CSV data
+        """
+        if self._last_parse is not None and self._last_parse[0] == self._file_key(file_path):
+            _, df, self.delimiter, self.detected_encoding = self._last_parse
+            logger.info(f"Reusing parsed CSV for {file_path.name}")
+            return df.head(nrows) if nrows is not None else df
+        
+        return self.parse(file_path, nrows=nrows)
+    
+    @staticmethod
+    def _file_key(file_path: Path) -> Tuple[str, int, int]:
+        """Return (path, mtime_ns, size) identifying the current file content."""
+        stat = file_path.stat()
+        return str(file_path), stat.st_mtime_ns, stat.st_size
+    
+    def _get_structure_metadata(self, file_path: Path, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add encoding, delimiter and columns to metadata without parsing the data.
+        
+        Args:
+            file_path: Path to the CSV file
+            metadata: Basic file metadata
+            
+        Returns:
+            Dictionary containing CSV metadata
+        """
+        try:
+            if not (self.detected_encoding and self.delimiter):
+                head = self._read_head(file_path)
+                self.detected_encoding = self.detected_encoding or self._detect_encoding(head)
+                self.delimiter = self.delimiter or self._detect_delimiter(head, self.detected_encoding)
+            
+            columns = pd.read_csv(file_path, sep=self.delimiter, encoding=self.detected_encoding,
+                                  nrows=0).columns.tolist()
+            metadata.update({
+                "delimiter": self.delimiter,
+                "detected_encoding": self.detected_encoding,
+                "file_encoding": self.encoding,
+                "columns": columns,
+                "column_count": len(columns)
+            })
             
         except Exception as e:
             logger.debug(f"Could not extract CSV metadata: {e}")
@@ -387,6 +616,10 @@ class CSVParser(BaseParser):
         """
         Detect if CSV file has a header row.
         
+        The first two lines of the sniffed head are split with the detected
+        delimiter; a first-row field counts as text unless it and the field
+        below it are numeric (as read_csv would type the column).
+        
         Args:
             file_path: Path to the CSV file
             
@@ -394,15 +627,19 @@ class CSVParser(BaseParser):
             True if file likely has header
         """
         try:
-            # Read first two rows
-            df_with_header = pd.read_csv(file_path, nrows=2)
-            df_without_header = pd.read_csv(file_path, header=None, nrows=2)
+            sample = self._decode_sample(self._read_head(file_path, SNIFF_SAMPLE_BYTES),
+                                         self.detected_encoding or self.encoding)
+            rows = list(islice(csv.reader(io.StringIO(sample),
+                                          delimiter=self.delimiter or ','), 2))
+            first_row = rows[0]
+            second_row = rows[1] if len(rows) > 1 else []
             
-            # Check if first row values are significantly different from data
-            first_row = df_without_header.iloc[0]
-            
-            # Count how many values in first row are strings
-            string_count = sum(1 for val in first_row if isinstance(val, str))
+            # Count how many values in first row are strings (empty fields are NaN)
+            string_count = 0
+            for i, value in enumerate(first_row):
+                below = second_row[i] if i < len(second_row) else ''
+                if value and not (self._is_number(value) and (not below or self._is_number(below))):
+                    string_count += 1
             
             # If most values are strings, likely a header
             return string_count > len(first_row) * 0.7
@@ -410,12 +647,24 @@ class CSVParser(BaseParser):
         except Exception:
             return True  # Default assume header exists
     
-    def validate_structure(self, df: pd.DataFrame) -> List[str]:
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        """Check whether a CSV field would be read as a number."""
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+    
+    def validate_structure(self, df: pd.DataFrame,
+                           null_counts: Optional[pd.Series] = None) -> List[str]:
         """
         Validate CSV structure and return list of issues.
         
         Args:
             df: DataFrame to validate
+            null_counts: Per-column null counts of df (df.isna().sum()), if
+                already computed by the caller
             
         Returns:
             List of validation issues
@@ -434,7 +683,9 @@ class CSVParser(BaseParser):
             issues.append(f"Very large file: {len(df)} rows")
         
         # Check for completely empty columns
-        empty_cols = df.columns[df.isnull().all()].tolist()
+        if null_counts is None:
+            null_counts = df.isna().sum()
+        empty_cols = null_counts[null_counts == len(df)].index.tolist()
         if empty_cols:
             issues.append(f"Completely empty columns: {empty_cols}")
         
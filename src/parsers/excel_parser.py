@@ -1,17 +1,42 @@
 import logging
+import re
+import zipfile
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from xml.etree import ElementTree
+from typing import BinaryIO, Dict, Any, Iterator, Optional, List, Union
+import numpy as np
 import pandas as pd
 import openpyxl
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
 from parsers.base_parser import BaseParser
 
+try:
+    import python_calamine  # noqa: F401
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
 logger = logging.getLogger(__name__)
 
+# Worksheet XML elements read by _read_merged_ranges
+SHEET_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+MERGE_CELL_TAG = SHEET_MAIN_NS + "mergeCell"
+ROW_TAG = SHEET_MAIN_NS + "row"
+
+# Formula element (<f>, <f .../>, optionally namespace-prefixed) in worksheet XML
+FORMULA_TAG_RE = re.compile(rb'<(?:\w+:)?f[\s>/]')
+
+# Chunk size for scanning worksheet XML for formulas
+FORMULA_SCAN_BYTES = 1024 * 1024
+
 
 class ExcelParser(BaseParser):
     """Parser for Excel files (xlsx, xls)."""
     
+    CACHED_STATE = ('sheets', 'active_sheet')
+    ACCEPTS_FILEOBJ = True
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialize ExcelParser.
@@ -23,13 +48,15 @@ class ExcelParser(BaseParser):
         self.sheets: Dict[str, pd.DataFrame] = {}
         self.active_sheet: Optional[str] = None
     
-    def parse(self, file_path: Path, sheet_name: Optional[Union[str, int]] = None) -> pd.DataFrame:
+    def parse(self, file_path: Path, sheet_name: Optional[Union[str, int]] = None,
+              fileobj: Optional[BinaryIO] = None) -> pd.DataFrame:
         """
         Parse Excel file and return DataFrame.
         
         Args:
             file_path: Path to the Excel file
             sheet_name: Specific sheet to parse (None for active/first sheet)
+            fileobj: Already read file content (read from file_path if None)
             
         Returns:
             DataFrame containing Excel data
@@ -38,38 +65,34 @@ class ExcelParser(BaseParser):
             return pd.DataFrame()
         
         try:
-            # Determine file type and use appropriate engine
-            if file_path.suffix.lower() == '.xls':
-                engine = 'xlrd'
-            else:
-                engine = 'openpyxl'
-            
-            # Read all sheets first to understand structure
-            excel_file = pd.ExcelFile(file_path, engine=engine)
-            self.sheets = {}
-            
-            # If specific sheet requested
-            if sheet_name is not None:
-                df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine)
-                self.sheets[str(sheet_name)] = df
-                self.active_sheet = str(sheet_name)
-                return self.clean_dataframe(df)
-            
-            # Parse all sheets
-            for sheet in excel_file.sheet_names:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=sheet, engine=engine)
-                    if not df.empty:
-                        self.sheets[sheet] = self.clean_dataframe(df)
-                        logger.debug(f"Parsed sheet '{sheet}': {len(df)} rows")
-                except Exception as e:
-                    logger.warning(f"Failed to parse sheet '{sheet}': {e}")
+            engine = self._select_engine(file_path)
+            
+            # Open the workbook once; all sheets are read from it
+            source = fileobj if fileobj is not None else file_path
+            with pd.ExcelFile(source, engine=engine) as excel_file:
+                self.sheets = {}
+                
+                # If specific sheet requested
+                if sheet_name is not None:
+                    df = excel_file.parse(sheet_name=sheet_name)
+                    self.sheets[str(sheet_name)] = df
+                    self.active_sheet = str(sheet_name)
+                    return self.clean_dataframe(df)
+                
+                # Parse all sheets
+                for sheet in excel_file.sheet_names:
+                    try:
+                        df = excel_file.parse(sheet_name=sheet)
+                        if not df.empty:
+                            self.sheets[sheet] = self.clean_dataframe(df)
+                            logger.debug(f"Parsed sheet '{sheet}': {len(df)} rows")
+                    except Exception as e:
+                        logger.warning(f"Failed to parse sheet '{sheet}': {e}")
             
             # Return the largest sheet or first non-empty sheet
             if self.sheets:
                 # Find sheet with most data
-                largest_sheet = max(self.sheets.items(), 
-                                  key=lambda x: len(x[1]) * len(x[1].columns))
+                largest_sheet = max(self.sheets.items(), key=lambda x: x[1].size)
                 self.active_sheet = largest_sheet[0]
                 logger.info(f"Selected sheet '{self.active_sheet}' as primary")
                 return largest_sheet[1]
@@ -80,6 +103,21 @@ class ExcelParser(BaseParser):
             logger.error(f"Failed to parse Excel file {file_path}: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _select_engine(file_path: Path) -> str:
+        """
+        Select the pandas engine for an Excel file.
+        
+        Args:
+            file_path: Path to the Excel file
+            
+        Returns:
+            'xlrd' for legacy .xls files, otherwise 'calamine' if installed, else 'openpyxl'
+        """
+        if file_path.suffix.lower() == '.xls':
+            return 'xlrd'
+        return 'calamine' if HAS_CALAMINE else 'openpyxl'
+    
     def parse_all_sheets(self, file_path: Path) -> Dict[str, pd.DataFrame]:
         """
         Parse all sheets from Excel file.
@@ -119,7 +157,8 @@ class ExcelParser(BaseParser):
             return ""
         
         text_parts = []
-        total_chars = 0
+        # Characters left before max_chars is reached
+        budget = max_chars
         
         try:
             # Parse sheets if not already done
@@ -127,30 +166,30 @@ class ExcelParser(BaseParser):
                 self.parse_all_sheets(file_path)
             
             for sheet_name, df in self.sheets.items():
-                if total_chars >= max_chars:
+                if budget <= 0:
                     break
                 
-                # Add sheet header
-                sheet_text = f"\n=== Sheet: {sheet_name} ===\n"
+                # Add sheet header and column names
+                header = (f"\n=== Sheet: {sheet_name} ===\n"
+                          "Columns: " + ", ".join(df.columns.astype(str)) + "\n\n")
+                text_parts.append(header)
+                budget -= len(header)
                 
-                # Add column names
-                sheet_text += "Columns: " + ", ".join(df.columns.astype(str)) + "\n\n"
-                
-                # Add data rows (limit to prevent huge text)
+                # Add data rows (limit to prevent huge text); rows are only
+                # formatted while there is budget left
                 max_rows = min(100, len(df))
-                for idx, row in df.head(max_rows).iterrows():
-                    if total_chars + len(sheet_text) >= max_chars:
+                for row_line in self._iter_row_lines(df.head(max_rows)):
+                    if budget <= 0:
                         break
                     
-                    row_text = " | ".join(str(val) for val in row.values)
-                    sheet_text += f"Row {idx + 1}: {row_text}\n"
+                    text_parts.append(row_line)
+                    budget -= len(row_line)
                 
                 # Add summary if more rows exist
                 if len(df) > max_rows:
-                    sheet_text += f"\n... and {len(df) - max_rows} more rows\n"
-                
-                text_parts.append(sheet_text)
-                total_chars += len(sheet_text)
+                    summary = f"\n... and {len(df) - max_rows} more rows\n"
+                    text_parts.append(summary)
+                    budget -= len(summary)
             
             return "".join(text_parts)[:max_chars]
             
@@ -158,6 +197,26 @@ class ExcelParser(BaseParser):
             logger.error(f"Failed to extract text from Excel: {e}")
             return ""
     
+    @staticmethod
+    def _iter_row_lines(df: pd.DataFrame) -> Iterator[str]:
+        """
+        Yield rows as 'Row n: value | ...' lines.
+        
+        Values are taken from one row-wise array instead of a Series per
+        row, and render as they would when iterating over the rows.
+        
+        Args:
+            df: Rows to format
+            
+        Yields:
+            One newline-terminated line per row
+        """
+        values = df.to_numpy()
+        # tolist() would turn datetime64[ns] values into integers
+        rows = values if values.dtype.kind in 'mM' else values.tolist()
+        for idx, row in zip(df.index, rows):
+            yield f"Row {idx + 1}: " + " | ".join(map(str, row)) + "\n"
+    
     def get_metadata(self, file_path: Path) -> Dict[str, Any]:
         """
         Extract metadata from Excel file.
@@ -172,16 +231,18 @@ class ExcelParser(BaseParser):
         
         try:
             # Basic metadata from pandas
-            excel_file = pd.ExcelFile(file_path)
+            with pd.ExcelFile(file_path, engine=self._select_engine(file_path)) as excel_file:
+                sheet_names = excel_file.sheet_names
             metadata.update({
-                "sheet_count": len(excel_file.sheet_names),
-                "sheet_names": excel_file.sheet_names,
+                "sheet_count": len(sheet_names),
+                "sheet_names": sheet_names,
                 "active_sheet": self.active_sheet
             })
             
             # Try to get more metadata using openpyxl for xlsx files
             if file_path.suffix.lower() == '.xlsx':
-                workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+                workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True,
+                                                  keep_links=False)
                 
                 # Document properties
                 props = workbook.properties
@@ -203,7 +264,8 @@ class ExcelParser(BaseParser):
                     sheet_details[sheet_name] = {
                         "max_row": sheet.max_row,
                         "max_column": sheet.max_column,
-                        "dimension": str(sheet.dimensions) if sheet.dimensions else None
+                        # Read-only sheets only know the stored dimension, if any
+                        "dimension": sheet.calculate_dimension() if sheet.max_row else None
                     }
                 
                 metadata["sheet_details"] = sheet_details
@@ -238,39 +300,34 @@ class ExcelParser(BaseParser):
             Row index of likely header (0-based)
         """
         try:
-            # Read first 20 rows without header
+            # Read the rows that are scored, without header; None would
+            # return a dict of all sheets, so default to the first sheet
             df_sample = pd.read_excel(
                 file_path, 
-                sheet_name=sheet_name,
+                sheet_name=sheet_name if sheet_name is not None else 0,
                 header=None,
-                nrows=20
+                nrows=10,
+                engine=self._select_engine(file_path)
             )
             
-            # Look for row with most non-null, unique values
-            best_row = 0
-            best_score = 0
+            # Score all rows at once on an object array of the cell values
+            sample = df_sample.to_numpy(dtype=object)
+            not_null = pd.notna(sample)
+            non_null = not_null.sum(axis=1)
+            unique = np.array([len(set(row[mask])) for row, mask in zip(sample, not_null)], dtype=int)
             
-            for i in range(min(10, len(df_sample))):
-                row = df_sample.iloc[i]
-                
-                # Skip if row is mostly empty
-                if row.isna().sum() > len(row) * 0.7:
-                    continue
-                
-                # Calculate score based on uniqueness and non-null values
-                non_null = row.notna().sum()
-                unique = row.nunique()
-                
-                # Check if values look like headers (strings, not numbers)
-                string_values = sum(1 for val in row if isinstance(val, str))
-                
-                score = non_null + unique * 2 + string_values * 3
-                
-                if score > best_score:
-                    best_score = score
-                    best_row = i
+            # Check if values look like headers (strings, not numbers)
+            string_values = np.vectorize(lambda val: isinstance(val, str), otypes=[bool])(sample).sum(axis=1)
             
-            return best_row
+            scores = non_null + unique * 2 + string_values * 3
+            
+            # Skip rows that are mostly empty
+            scores[(sample.shape[1] - non_null) > sample.shape[1] * 0.7] = 0
+            
+            # Look for row with most non-null, unique values (first one wins ties)
+            if len(scores) == 0 or scores.max() <= 0:
+                return 0
+            return int(np.argmax(scores))
             
         except Exception as e:
             logger.debug(f"Could not detect header row: {e}")
@@ -293,7 +350,13 @@ class ExcelParser(BaseParser):
             return formulas
         
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=False)
+            # Most exported workbooks have no formulas; skip loading those
+            if not self._has_formulas(file_path):
+                return formulas
+            
+            # Read-only mode streams the cells; formulas are kept since data_only=False
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=False,
+                                              keep_links=False)
             
             sheets_to_check = [sheet_name] if sheet_name else workbook.sheetnames
             
@@ -305,9 +368,12 @@ class ExcelParser(BaseParser):
                 
                 for row in sheet.iter_rows():
                     for cell in row:
-                        if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
+                        # The cell type is set from the XML, so text that merely
+                        # starts with '=' is not reported as a formula
+                        if cell.data_type == 'f':
                             cell_ref = f"{sheet_name}!{cell.coordinate}"
-                            formulas[cell_ref] = cell.value
+                            # Array formulas are objects holding the formula text
+                            formulas[cell_ref] = getattr(cell.value, 'text', cell.value)
             
             workbook.close()
             
@@ -316,6 +382,39 @@ class ExcelParser(BaseParser):
         
         return formulas
     
+    @staticmethod
+    def _has_formulas(file_path: Path) -> bool:
+        """
+        Check whether any worksheet of an xlsx file contains a formula.
+        
+        The raw worksheet XML is scanned for formula elements, which is much
+        faster than loading the cells with openpyxl.
+        
+        Args:
+            file_path: Path to the Excel file
+            
+        Returns:
+            False if no worksheet contains a formula, True otherwise
+        """
+        with zipfile.ZipFile(file_path) as archive:
+            parts = [name for name in archive.namelist()
+                     if name.startswith('xl/worksheets/') and name.endswith('.xml')]
+            
+            # Unusual package layout; let openpyxl find the worksheets
+            if not parts:
+                return True
+            
+            for name in parts:
+                with archive.open(name) as source:
+                    tail = b''
+                    while chunk := source.read(FORMULA_SCAN_BYTES):
+                        # Keep the end of the previous chunk so split tags are found
+                        if FORMULA_TAG_RE.search(tail + chunk):
+                            return True
+                        tail = chunk[-8:]
+        
+        return False
+    
     def get_cell_formatting(self, file_path: Path, sheet_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract cell formatting information.
@@ -338,18 +437,30 @@ class ExcelParser(BaseParser):
             return formatting
         
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
+            # Read-only mode streams only the rows that are checked instead of
+            # loading every cell of the workbook
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True,
+                                              keep_links=False)
             
             sheet = workbook[sheet_name] if sheet_name else workbook.active
             
-            # Merged cells
-            for merged_range in sheet.merged_cells.ranges:
-                formatting["merged_cells"].append(str(merged_range))
+            # Merged cells (not exposed by read-only worksheets)
+            merged_ranges = self._read_merged_ranges(file_path, sheet._worksheet_path)
+            formatting["merged_cells"] = [str(merged_range) for merged_range in merged_ranges]
+            
+            # Cells covered by a merged range, except its top-left cell, hold no value
+            covered = {
+                (row, col)
+                for merged_range in merged_ranges
+                if merged_range.min_row <= 20 and merged_range.min_col <= 20
+                for row, col in merged_range.cells
+                if (row, col) != (merged_range.min_row, merged_range.min_col)
+            }
             
             # Check formatting in first 100 cells
             for row in sheet.iter_rows(max_row=20, max_col=20):
                 for cell in row:
-                    if cell.value is not None:
+                    if cell.value is not None and (cell.row, cell.column) not in covered:
                         # Check for fill color
                         if cell.fill and cell.fill.fgColor and cell.fill.fgColor.rgb:
                             formatting["colored_cells"].append(cell.coordinate)
@@ -370,4 +481,26 @@ class ExcelParser(BaseParser):
         except Exception as e:
             logger.debug(f"Could not extract formatting: {e}")
         
-        return formatting
\ No newline at end of file
+        return formatting
+    
+    @staticmethod
+    def _read_merged_ranges(file_path: Path, worksheet_path: str) -> List[CellRange]:
+        """
+        Read the merged cell ranges of a worksheet from its XML part.
+        
+        Args:
+            file_path: Path to the Excel file
+            worksheet_path: Path of the worksheet XML inside the archive
+            
+        Returns:
+            Merged ranges in worksheet order
+        """
+        refs = []
+        with zipfile.ZipFile(file_path) as archive, archive.open(worksheet_path) as source:
+            for _, elem in ElementTree.iterparse(source):
+                if elem.tag == MERGE_CELL_TAG:
+                    refs.append(elem.get('ref'))
+                elif elem.tag == ROW_TAG:
+                    # Cell data is not needed; keep memory flat on large sheets
+                    elem.clear()
+        return [CellRange(ref) for ref in refs]
\ No newline at end of file
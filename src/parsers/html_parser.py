@@ -1,17 +1,34 @@
+import copy
+import io
+import json
 import logging
+from collections import Counter
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List, Tuple
 import pandas as pd
 from bs4 import BeautifulSoup
 import re
 from parsers.base_parser import BaseParser
 
+try:
+    # Optional C JSON decoder for JSON-LD blocks
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of bytes read from an HTML file; larger files are truncated
+MAX_HTML_BYTES = 64 * 1024 * 1024
+
 
 class HTMLParser(BaseParser):
     """Parser for HTML files containing tables or structured data."""
     
+    CACHED_STATE = ('tables',)
+    ACCEPTS_FILEOBJ = True
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialize HTMLParser.
@@ -21,15 +38,19 @@ class HTMLParser(BaseParser):
         """
         super().__init__(encoding)
         self.soup: Optional[BeautifulSoup] = None
+        # (path, mtime_ns, size) of the file self.soup was built from
+        self._soup_key: Optional[Tuple[str, int, int]] = None
         self.tables: List[pd.DataFrame] = []
     
-    def parse(self, file_path: Path, table_index: Optional[int] = None) -> pd.DataFrame:
+    def parse(self, file_path: Path, table_index: Optional[int] = None,
+              fileobj: Optional[BinaryIO] = None) -> pd.DataFrame:
         """
         Parse HTML file and extract tables as DataFrame.
         
         Args:
             file_path: Path to the HTML file
             table_index: Specific table index to extract (None for largest/best)
+            fileobj: Already read file content (read from file_path if None)
             
         Returns:
             DataFrame containing table data
@@ -38,16 +59,16 @@ class HTMLParser(BaseParser):
             return pd.DataFrame()
         
         try:
-            # Read HTML content
-            with open(file_path, 'r', encoding=self.encoding, errors='ignore') as f:
-                html_content = f.read()
+            # Read HTML content once; pandas and BeautifulSoup both parse these bytes
+            html_bytes = self._read_html(file_path, fileobj)
             
-            # Parse with BeautifulSoup
-            self.soup = BeautifulSoup(html_content, 'lxml')
+            # The soup is only needed by the fallbacks below; otherwise
+            # extract_text and get_metadata build it on demand
+            self.soup = None
             
             # Try pandas HTML reader first (more robust for tables)
             try:
-                tables = pd.read_html(str(file_path))
+                tables = pd.read_html(io.BytesIO(html_bytes))
                 
                 if tables:
                     self.tables = [self.clean_dataframe(df) for df in tables]
@@ -56,13 +77,17 @@ class HTMLParser(BaseParser):
                         return self.tables[table_index]
                     
                     # Return largest table
-                    largest_table = max(self.tables, key=lambda df: len(df) * len(df.columns))
+                    largest_table = max(self.tables, key=attrgetter('size'))
                     logger.info(f"Found {len(self.tables)} tables, returning largest")
                     return largest_table
                     
             except Exception as e:
                 logger.debug(f"Pandas HTML parsing failed, trying BeautifulSoup: {e}")
             
+            # Parse with BeautifulSoup
+            self.soup = self._make_soup(html_bytes)
+            self._soup_key = self._file_key(file_path)
+            
             # Fallback to manual table extraction
             extracted_tables = self._extract_tables_manually()
             
@@ -73,7 +98,7 @@ class HTMLParser(BaseParser):
                     return self.tables[table_index]
                 
                 # Return largest table
-                return max(self.tables, key=lambda df: len(df) * len(df.columns))
+                return max(self.tables, key=attrgetter('size'))
             
             # If no tables found, try to extract structured data
             return self._extract_structured_data()
@@ -82,6 +107,73 @@ class HTMLParser(BaseParser):
             logger.error(f"Failed to parse HTML file {file_path}: {e}")
             return pd.DataFrame()
     
+    def _ensure_soup(self, file_path: Path) -> BeautifulSoup:
+        """
+        Return the BeautifulSoup tree for a file, parsing it only if needed.
+        
+        Args:
+            file_path: Path to the HTML file
+            
+        Returns:
+            Parsed BeautifulSoup tree
+        """
+        key = self._file_key(file_path)
+        if self.soup is None or self._soup_key != key:
+            self.soup = self._make_soup(self._read_html(file_path))
+            self._soup_key = key
+        return self.soup
+    
+    @staticmethod
+    def _read_html(file_path: Path, fileobj: Optional[BinaryIO] = None) -> bytes:
+        """
+        Read at most MAX_HTML_BYTES of HTML content.
+        
+        Only the part within the limit is copied into memory; safe_parse
+        passes a file object over the memory mapping, so larger files are
+        never read as a whole.
+        
+        Args:
+            file_path: Path to the HTML file
+            fileobj: File object with the content (file_path is opened if None)
+            
+        Returns:
+            HTML file content, truncated if the file is larger than the limit
+        """
+        if fileobj is not None:
+            html_bytes = fileobj.read(MAX_HTML_BYTES)
+            truncated = bool(fileobj.read(1))
+        else:
+            with open(file_path, 'rb') as f:
+                html_bytes = f.read(MAX_HTML_BYTES)
+                truncated = bool(f.read(1))
+        
+        if truncated:
+            logger.warning(f"HTML file {file_path.name} is larger than "
+                           f"{MAX_HTML_BYTES // (1024 * 1024)} MB; only the first part is parsed")
+        
+        return html_bytes
+    
+    @staticmethod
+    def _file_key(file_path: Path) -> Tuple[str, int, int]:
+        """Return (path, mtime_ns, size) identifying the current file content."""
+        stat = file_path.stat()
+        return str(file_path), stat.st_mtime_ns, stat.st_size
+    
+    def _make_soup(self, html_bytes: bytes) -> BeautifulSoup:
+        """
+        Build the BeautifulSoup tree from raw HTML bytes.
+        
+        Args:
+            html_bytes: HTML file content
+            
+        Returns:
+            Parsed BeautifulSoup tree
+        """
+        # Decode exactly as reading the file in text mode would
+        with io.TextIOWrapper(io.BytesIO(html_bytes), encoding=self.encoding, errors='ignore') as f:
+            html_content = f.read()
+        return BeautifulSoup(html_content, 'lxml')
+    
     def _extract_tables_manually(self) -> List[pd.DataFrame]:
         """
         Manually extract tables from HTML using BeautifulSoup.
@@ -114,9 +206,10 @@ class HTMLParser(BaseParser):
                 rows = []
                 tbody = table_elem.find('tbody') or table_elem
                 
+                first_tr = table_elem.find('tr')
                 for tr in tbody.find_all('tr'):
                     # Skip header row if already processed
-                    if tr == table_elem.find('tr') and headers:
+                    if headers and tr == first_tr:
                         continue
                     
                     row = [td.get_text(strip=True) for td in tr.find_all(['td', 'th'])]
@@ -230,6 +323,11 @@ class HTMLParser(BaseParser):
         
         return data if len(data) > 1 else {}
     
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore cached tables; the soup is re-read from the file on demand."""
+        super()._restore_state(state)
+        self.soup = None
+    
     def extract_text(self, file_path: Path, max_chars: int = 50000) -> str:
         """
         Extract text content from HTML for LLM processing.
@@ -245,18 +343,17 @@ class HTMLParser(BaseParser):
             return ""
         
         try:
-            # Parse if not already done
-            if not self.soup:
-                with open(file_path, 'r', encoding=self.encoding, errors='ignore') as f:
-                    html_content = f.read()
-                self.soup = BeautifulSoup(html_content, 'lxml')
+            soup = self._ensure_soup(file_path)
             
-            # Remove script and style elements
-            for script in self.soup(['script', 'style']):
-                script.decompose()
+            # Remove script and style elements from a copy, so the cached
+            # tree keeps them for get_metadata
+            if soup.find(['script', 'style']):
+                soup = copy.copy(soup)
+                for script in soup(['script', 'style']):
+                    script.decompose()
             
             # Extract title
-            title = self.soup.title.string if self.soup.title else ""
+            title = soup.title.string if soup.title else ""
             
             # Extract main content
             text_parts = []
@@ -266,7 +363,7 @@ class HTMLParser(BaseParser):
             
             # Extract headings and their content
             for heading_tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                for heading in self.soup.find_all(heading_tag):
+                for heading in soup.find_all(heading_tag):
                     text_parts.append(f"\n{heading_tag.upper()}: {heading.get_text(strip=True)}")
             
             # Extract table data
@@ -283,7 +380,7 @@ class HTMLParser(BaseParser):
                         text_parts.append(row_text)
             
             # Extract paragraph text
-            paragraphs = self.soup.find_all('p')
+            paragraphs = soup.find_all('p')
             if paragraphs:
                 text_parts.append("\n\nContent:")
                 for p in paragraphs[:50]:  # Limit to first 50 paragraphs
@@ -292,7 +389,7 @@ class HTMLParser(BaseParser):
                         text_parts.append(text)
             
             # Extract list items
-            lists = self.soup.find_all(['ul', 'ol'])
+            lists = soup.find_all(['ul', 'ol'])
             if lists:
                 text_parts.append("\n\nList items:")
                 for list_elem in lists[:10]:  # Limit to first 10 lists
@@ -319,40 +416,43 @@ class HTMLParser(BaseParser):
         metadata = super().get_metadata(file_path)
         
         try:
-            if not self.soup:
-                with open(file_path, 'r', encoding=self.encoding, errors='ignore') as f:
-                    html_content = f.read()
-                self.soup = BeautifulSoup(html_content, 'lxml')
+            self._ensure_soup(file_path)
             
-            # Extract meta tags
+            # Collect meta tags, JSON-LD scripts and tag counts in one walk over the tree
             meta_info = {}
-            for meta in self.soup.find_all('meta'):
-                name = meta.get('name') or meta.get('property')
-                content = meta.get('content')
+            json_ld_scripts = []
+            tag_counts = Counter()
+            for tag in self.soup.find_all(True):
+                tag_counts[tag.name] += 1
                 
-                if name and content:
-                    meta_info[name] = content
+                if tag.name == 'meta':
+                    name = tag.get('name') or tag.get('property')
+                    content = tag.get('content')
+                    
+                    if name and content:
+                        meta_info[name] = content
+                elif tag.name == 'script' and tag.get('type') == 'application/ld+json':
+                    json_ld_scripts.append(tag)
             
             metadata.update({
                 "title": self.soup.title.string if self.soup.title else None,
                 "meta_tags": meta_info,
-                "table_count": len(self.soup.find_all('table')),
-                "form_count": len(self.soup.find_all('form')),
-                "link_count": len(self.soup.find_all('a')),
-                "image_count": len(self.soup.find_all('img')),
-                "has_javascript": bool(self.soup.find_all('script')),
-                "has_css": bool(self.soup.find_all(['style', 'link'])),
+                "table_count": tag_counts['table'],
+                "form_count": tag_counts['form'],
+                "link_count": tag_counts['a'],
+                "image_count": tag_counts['img'],
+                "has_javascript": tag_counts['script'] > 0,
+                "has_css": tag_counts['style'] + tag_counts['link'] > 0,
                 "encoding": self.soup.original_encoding if hasattr(self.soup, 'original_encoding') else self.encoding
             })
             
             # Extract structured data (JSON-LD)
-            json_ld_scripts = self.soup.find_all('script', type='application/ld+json')
             if json_ld_scripts:
                 structured_data = []
                 for script in json_ld_scripts:
                     try:
-                        import json
-                        data = json.loads(script.string)
+                        # orjson only accepts exact str, not NavigableString
+                        data = json_loads(str(script.string))
                         structured_data.append(data)
                     except Exception:
                         pass
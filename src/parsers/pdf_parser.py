@@ -1,18 +1,78 @@
+import io
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import BinaryIO, Iterator, List, Optional, Dict, Any, Tuple, Union
 import pandas as pd
 import pdfplumber
 from PyPDF2 import PdfReader
 import re
 from parsers.base_parser import BaseParser
+from utils.file_handler import open_mapped
 
 logger = logging.getLogger(__name__)
 
+# Common header keywords (case-insensitive), matched as substrings of table cells
+HEADER_KEYWORDS = (
+    'name', 'id', 'date', 'time', 'status', 'type', 'description',
+    'total', 'count', 'amount', 'value', 'start', 'stop', 'end',
+    'job', 'task', 'vm', 'machine', 'server', 'client', 'user',
+    'result', 'state', 'duration', 'size', 'gb', 'mb', 'speed',
+    'details', 'info', 'processed', 'backup', 'report'
+)
+_HEADER_KEYWORD_RE = re.compile('|'.join(map(re.escape, HEADER_KEYWORDS)))
+
+# Cell made up of digits and separators only
+_NUMERIC_CELL_RE = re.compile(r'^[\d\s\.,:\-/]+$')
+
+# Column gap in extracted text lines: two or more whitespace characters or a tab
+_COLUMN_SEPARATOR_RE = re.compile(r'\s{2,}|\t')
+
+
+def _page_tables(page) -> List:
+    """
+    Extract the raw tables of a pdfplumber page.
+    
+    The default 'lines' table strategy builds cells from ruling edges only,
+    so pages without lines, rects or curves are skipped before the table
+    finder runs.
+    
+    Args:
+        page: pdfplumber page
+        
+    Returns:
+        Raw tables of the page
+    """
+    if not page.edges:
+        return []
+    return page.extract_tables()
+
+
+def _extract_page_tables(pdf_bytes: bytes, page_numbers: List[int]) -> List[Tuple[int, List]]:
+    """
+    Extract the raw tables of some pages of a PDF (process pool worker).
+    
+    Args:
+        pdf_bytes: PDF file content
+        page_numbers: 1-based numbers of the pages to extract
+        
+    Returns:
+        (page number, raw tables of the page) for each page
+    """
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return [(page_num, _page_tables(pdf.pages[page_num - 1])) for page_num in page_numbers]
+
 
 class PDFParser(BaseParser):
     """Parser for PDF files."""
     
+    CACHED_STATE = ('tables',)
+    ACCEPTS_FILEOBJ = True
+    
+    # Worker processes for table extraction of multi-page PDFs (0 or 1 = in-process)
+    page_processes: int = 0
+    
     def __init__(self, encoding: str = 'utf-8'):
         """
         Initialize PDFParser.
@@ -23,12 +83,13 @@ class PDFParser(BaseParser):
         super().__init__(encoding)
         self.tables: List[pd.DataFrame] = []
     
-    def parse(self, file_path: Path) -> pd.DataFrame:
+    def parse(self, file_path: Path, fileobj: Optional[BinaryIO] = None) -> pd.DataFrame:
         """
         Parse PDF file and extract tables as DataFrame.
         
         Args:
             file_path: Path to the PDF file
+            fileobj: Already read file content (read from file_path if None)
             
         Returns:
             DataFrame containing merged tables or text data
@@ -37,8 +98,14 @@ class PDFParser(BaseParser):
             return pd.DataFrame()
         
         try:
+            # Scanned documents have no text objects, so pdfplumber cannot find tables in them
+            if self._is_image_only(file_path, fileobj):
+                logger.info("PDF contains no text resources (scanned images), skipping table extraction")
+                self.metadata['image_only'] = True
+                return self._extract_text_as_dataframe(file_path)
+            
             # Try to extract tables using pdfplumber
-            tables = self._extract_tables_pdfplumber(file_path)
+            tables = self._extract_tables_pdfplumber(fileobj if fileobj is not None else file_path)
             
             if tables:
                 # Merge all tables into one DataFrame
@@ -55,13 +122,13 @@ class PDFParser(BaseParser):
             logger.error(f"Failed to parse PDF {file_path}: {e}")
             return pd.DataFrame()
     
-    def _extract_tables_pdfplumber(self, file_path: Path) -> List[pd.DataFrame]:
+    def _extract_tables_pdfplumber(self, file_path: Union[Path, BinaryIO]) -> List[pd.DataFrame]:
         """
         Extract tables from PDF using pdfplumber with intelligent header detection.
         Handles multi-page reports where first page has header and subsequent pages continue the data.
 
         Args:
-            file_path: Path to the PDF file
+            file_path: Path to the PDF file or file object with its content
 
         Returns:
             List of DataFrames containing table data
@@ -70,108 +137,134 @@ class PDFParser(BaseParser):
         detected_header = None  # Store header from first page for continuation pages
 
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extract tables from page
-                    page_tables = page.extract_tables()
-
-                    for table_num, table in enumerate(page_tables or [], 1):
-                        if table and len(table) > 0:
-                            try:
-                                # On first page, detect the header
-                                if detected_header is None:
-                                    header_idx = self._detect_header_row(table)
-
-                                    if header_idx < len(table) - 1:  # Ensure we have data rows after header
-                                        detected_header = table[header_idx]
-                                        data_rows = table[header_idx + 1:]
-                                        logger.info(f"Header detected on page {page_num} at row {header_idx}")
+            for page_num, page_tables in self._iter_page_tables(file_path):
+                for table_num, table in enumerate(page_tables or [], 1):
+                    if table and len(table) > 0:
+                        try:
+                            # On first page, detect the header
+                            if detected_header is None:
+                                header_idx = self._detect_header_row(table)
+
+                                if header_idx < len(table) - 1:  # Ensure we have data rows after header
+                                    detected_header = table[header_idx]
+                                    data_rows = table[header_idx + 1:]
+                                    logger.info(f"Header detected on page {page_num} at row {header_idx}")
+                                else:
+                                    logger.debug(f"No valid header found for table on page {page_num}")
+                                    continue
+                            else:
+                                # Continuation page - check if this is data continuation
+                                # If first row looks like data (not a header), use stored header
+                                # Check if detected_header would match the full header scan
+                                row_scores = self._score_header_rows(table)
+                                full_scan_header_idx = self._detect_header_row(table, row_scores)
+                                full_scan_header_score = row_scores[full_scan_header_idx] if full_scan_header_idx < len(row_scores) else 0
+
+                                # If the "best header" score is significantly lower than the original header,
+                                # this is likely a continuation page with data only
+                                if full_scan_header_score < 150:  # Header threshold
+                                    # This is a continuation page - all rows are data
+                                    data_rows = table
+                                    logger.info(f"Page {page_num}: Continuation page detected (score {full_scan_header_score:.1f} < 150), using stored header")
+                                else:
+                                    # This page has its own header
+                                    if full_scan_header_idx < len(table) - 1:
+                                        detected_header = table[full_scan_header_idx]
+                                        data_rows = table[full_scan_header_idx + 1:]
+                                        logger.info(f"Page {page_num}: New header detected at row {full_scan_header_idx} (score {full_scan_header_score:.1f})")
                                     else:
-                                        logger.debug(f"No valid header found for table on page {page_num}")
                                         continue
-                                else:
-                                    # Continuation page - check if this is data continuation
-                                    # If first row looks like data (not a header), use stored header
-                                    first_row_score = self._score_as_header(table[0])
-
-                                    # Also check if detected_header would match the full header scan
-                                    full_scan_header_idx = self._detect_header_row(table)
-                                    full_scan_header_score = self._score_as_header(table[full_scan_header_idx]) if full_scan_header_idx < len(table) else 0
-
-                                    # If the "best header" score is significantly lower than the original header,
-                                    # this is likely a continuation page with data only
-                                    if full_scan_header_score < 150:  # Header threshold
-                                        # This is a continuation page - all rows are data
-                                        data_rows = table
-                                        logger.info(f"Page {page_num}: Continuation page detected (score {full_scan_header_score:.1f} < 150), using stored header")
+
+                            if detected_header:
+                                # Handle column count mismatch (common in multi-page PDFs)
+                                header_cols = len(detected_header)
+
+                                # Find which column is missing by checking non-None header values
+                                # Continuation pages often skip empty columns
+                                non_none_header_indices = [i for i, h in enumerate(detected_header) if h]
+
+                                # Find indices with None headers (these are likely the missing columns)
+                                none_header_indices = {i for i, h in enumerate(detected_header) if not h}
+
+                                # Pad or trim data rows to match header column count
+                                normalized_rows = []
+                                for row in data_rows:
+                                    if len(row) < header_cols:
+                                        # If row has fewer columns, we need to figure out which column is missing:
+                                        # place empty values at the None-header positions, fill the remaining
+                                        # positions with the row values in order and pad the end
+                                        values = iter(row)
+                                        normalized_row = [
+                                            '' if i in none_header_indices else next(values, '')
+                                            for i in range(header_cols)
+                                        ]
+                                    elif len(row) > header_cols:
+                                        # Trim excess columns
+                                        normalized_row = row[:header_cols]
                                     else:
-                                        # This page has its own header
-                                        if full_scan_header_idx < len(table) - 1:
-                                            detected_header = table[full_scan_header_idx]
-                                            data_rows = table[full_scan_header_idx + 1:]
-                                            logger.info(f"Page {page_num}: New header detected at row {full_scan_header_idx} (score {full_scan_header_score:.1f})")
-                                        else:
-                                            continue
-
-                                if detected_header:
-                                    # Handle column count mismatch (common in multi-page PDFs)
-                                    header_cols = len(detected_header)
-
-                                    # Find which column is missing by checking non-None header values
-                                    # Continuation pages often skip empty columns
-                                    non_none_header_indices = [i for i, h in enumerate(detected_header) if h]
-
-                                    # Pad or trim data rows to match header column count
-                                    normalized_rows = []
-                                    for row in data_rows:
-                                        if len(row) < header_cols:
-                                            # If row has fewer columns, we need to figure out which column is missing
-                                            # For now, insert empty value at the first None-header position
-                                            normalized_row = list(row)
-
-                                            # Find indices with None headers (these are likely the missing columns)
-                                            none_header_indices = [i for i, h in enumerate(detected_header) if not h]
-
-                                            # Insert empty strings at None-header positions
-                                            for missing_idx in none_header_indices:
-                                                if missing_idx <= len(normalized_row):
-                                                    normalized_row.insert(missing_idx, '')
-
-                                            # If still not enough columns, pad at the end
-                                            if len(normalized_row) < header_cols:
-                                                normalized_row += [''] * (header_cols - len(normalized_row))
-
-                                            # Trim if too long
-                                            normalized_row = normalized_row[:header_cols]
-                                        elif len(row) > header_cols:
-                                            # Trim excess columns
-                                            normalized_row = row[:header_cols]
-                                        else:
-                                            normalized_row = row
-                                        normalized_rows.append(normalized_row)
-
-                                    # Convert to DataFrame
-                                    df = pd.DataFrame(normalized_rows, columns=detected_header)
-
-                                    # Add metadata
-                                    df['_page'] = page_num
-                                    df['_table'] = table_num
-
-                                    # Clean the DataFrame
-                                    df = self._clean_table_dataframe(df)
-
-                                    if not df.empty:
-                                        logger.info(f"Extracted {len(df)} rows from page {page_num}")
-                                        tables.append(df)
-
-                            except Exception as e:
-                                logger.error(f"Failed to process table on page {page_num}: {e}")
+                                        normalized_row = row
+                                    normalized_rows.append(normalized_row)
+
+                                # Convert to DataFrame
+                                df = pd.DataFrame(normalized_rows, columns=detected_header)
+
+                                # Add metadata
+                                df['_page'] = page_num
+                                df['_table'] = table_num
+
+                                # Clean the DataFrame
+                                df = self._clean_table_dataframe(df)
+
+                                if not df.empty:
+                                    logger.info(f"Extracted {len(df)} rows from page {page_num}")
+                                    tables.append(df)
+
+                        except Exception as e:
+                            logger.error(f"Failed to process table on page {page_num}: {e}")
 
         except Exception as e:
             logger.error(f"Failed to extract tables with pdfplumber: {e}")
 
         return tables
     
+    def _iter_page_tables(self, source: Union[Path, BinaryIO]) -> Iterator[Tuple[int, List]]:
+        """
+        Yield the raw tables of each page in page order.
+        
+        With page_processes > 1, the pages of a multi-page PDF are split
+        into contiguous ranges that worker processes extract in parallel;
+        otherwise pages are extracted one at a time in this process.
+        
+        Args:
+            source: Path to the PDF file or file object with its content
+            
+        Yields:
+            (1-based page number, raw tables of the page)
+        """
+        with pdfplumber.open(source) as pdf:
+            page_count = len(pdf.pages)
+            
+            if self.page_processes <= 1 or page_count < 2:
+                for page_num, page in enumerate(pdf.pages, 1):
+                    yield page_num, _page_tables(page)
+                return
+        
+        if isinstance(source, Path):
+            pdf_bytes = source.read_bytes()
+        else:
+            source.seek(0)
+            pdf_bytes = source.read()
+        
+        workers = min(self.page_processes, page_count)
+        page_numbers = list(range(1, page_count + 1))
+        chunk_size = -(-page_count // workers)
+        chunks = [page_numbers[i:i + chunk_size] for i in range(0, page_count, chunk_size)]
+        
+        logger.debug(f"Extracting tables of {page_count} pages in {len(chunks)} processes")
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            for chunk_tables in executor.map(_extract_page_tables, repeat(pdf_bytes), chunks):
+                yield from chunk_tables
+    
     def _score_as_header(self, row: List) -> float:
         """
         Score a single row to determine if it looks like a header.
@@ -182,15 +275,6 @@ class PDFParser(BaseParser):
         Returns:
             Score value (higher = more likely to be a header)
         """
-        # Common header keywords (case-insensitive)
-        header_keywords = {
-            'name', 'id', 'date', 'time', 'status', 'type', 'description',
-            'total', 'count', 'amount', 'value', 'start', 'stop', 'end',
-            'job', 'task', 'vm', 'machine', 'server', 'client', 'user',
-            'result', 'state', 'duration', 'size', 'gb', 'mb', 'speed',
-            'details', 'info', 'processed', 'backup', 'report'
-        }
-
         score = 0
         non_empty_count = 0
         numeric_count = 0
@@ -198,18 +282,19 @@ class PDFParser(BaseParser):
         text_length = 0
 
         for cell in row:
-            if cell and str(cell).strip():
-                cell_str = str(cell).strip()
+            if not cell:
+                continue
+            cell_str = str(cell).strip()
+            if cell_str:
                 non_empty_count += 1
                 text_length += len(cell_str)
 
                 # Check if cell is mostly numeric
-                if re.match(r'^[\d\s\.,:\-/]+$', cell_str):
+                if _NUMERIC_CELL_RE.match(cell_str):
                     numeric_count += 1
 
                 # Check for header keywords
-                cell_lower = cell_str.lower()
-                if any(keyword in cell_lower for keyword in header_keywords):
+                if _HEADER_KEYWORD_RE.search(cell_str.lower()):
                     keyword_count += 1
 
         # Calculate score based on heuristics
@@ -232,7 +317,19 @@ class PDFParser(BaseParser):
 
         return score
 
-    def _detect_header_row(self, table: List[List]) -> int:
+    def _score_header_rows(self, table: List[List]) -> List[float]:
+        """
+        Score the leading rows of a table as header candidates.
+
+        Args:
+            table: Raw table data as list of lists
+
+        Returns:
+            Header scores of the first 10 rows (at most)
+        """
+        return [self._score_as_header(row) for row in table[:10]]
+
+    def _detect_header_row(self, table: List[List], row_scores: Optional[List[float]] = None) -> int:
         """
         Intelligently detect which row is the actual header in a table.
 
@@ -244,6 +341,7 @@ class PDFParser(BaseParser):
 
         Args:
             table: Raw table data as list of lists
+            row_scores: Scores from _score_header_rows, if already computed
 
         Returns:
             Index of the most likely header row
@@ -251,16 +349,19 @@ class PDFParser(BaseParser):
         if not table or len(table) < 2:
             return 0
 
-        scores = []
+        if row_scores is None:
+            # Analyze the first 10 rows only, for performance
+            row_scores = self._score_header_rows(table)
 
-        # Analyze each row (limit to first 10 rows for performance)
-        for idx, row in enumerate(table[:min(10, len(table))]):
-            score = self._score_as_header(row)
+        scores = []
 
+        for idx, score in enumerate(row_scores):
             # Penalize very first row if it has very few cells (often title)
-            non_empty_count = sum(1 for cell in row if cell and str(cell).strip())
-            if idx == 0 and non_empty_count < len(row) * 0.5:
-                score -= 20
+            if idx == 0:
+                row = table[0]
+                non_empty_count = sum(1 for cell in row if cell and str(cell).strip())
+                if non_empty_count < len(row) * 0.5:
+                    score -= 20
 
             logger.debug(f"Row {idx}: score={score:.1f}")
             scores.append((idx, score))
@@ -291,7 +392,7 @@ class PDFParser(BaseParser):
         df = df.fillna('')
         
         # Remove completely empty rows
-        df = df.replace('', pd.NA).dropna(how='all').fillna('')
+        df = df[(df != '').any(axis=1)]
         
         # Strip whitespace
         for col in df.columns:
@@ -299,16 +400,30 @@ class PDFParser(BaseParser):
                 df[col] = df[col].str.strip()
         
         # Remove metadata columns if they're all the same
-        if '_page' in df.columns and df['_page'].nunique() == 1:
+        if '_page' in df.columns and self._is_constant(df['_page']):
             self.metadata['source_page'] = df['_page'].iloc[0]
             df = df.drop('_page', axis=1)
         
-        if '_table' in df.columns and df['_table'].nunique() == 1:
+        if '_table' in df.columns and self._is_constant(df['_table']):
             self.metadata['source_table'] = df['_table'].iloc[0]
             df = df.drop('_table', axis=1)
         
         return df
     
+    @staticmethod
+    def _is_constant(column: pd.Series) -> bool:
+        """
+        Check whether a column holds one value in all rows.
+        
+        Args:
+            column: Column to check
+            
+        Returns:
+            True if the column is non-empty and all values equal the first
+        """
+        values = column.to_numpy()
+        return len(values) > 0 and bool((values == values[0]).all())
+    
     def _merge_tables(self, tables: List[pd.DataFrame]) -> pd.DataFrame:
         """
         Merge multiple tables into one DataFrame.
@@ -334,8 +449,12 @@ class PDFParser(BaseParser):
         merged_groups = {}
 
         for table in tables:
-            # Create a key based on column names (sorted for consistency)
-            col_key = tuple(sorted(table.columns.tolist()))
+            # Create a key based on column names (order-independent); duplicate
+            # names must stay counted, otherwise the group cannot be concatenated
+            if table.columns.is_unique:
+                col_key = frozenset(table.columns)
+            else:
+                col_key = tuple(sorted(table.columns.tolist()))
 
             if col_key not in merged_groups:
                 merged_groups[col_key] = []
@@ -344,25 +463,23 @@ class PDFParser(BaseParser):
 
         logger.info(f"Found {len(merged_groups)} different table structures across {len(tables)} tables")
 
-        # Merge tables within each group
-        final_tables = []
-        for col_key, group_tables in merged_groups.items():
-            if len(group_tables) == 1:
-                final_tables.append(group_tables[0])
-                logger.debug(f"Single table with {len(group_tables[0])} rows")
-            else:
-                # Concatenate all tables with same structure (multi-page data)
-                merged = pd.concat(group_tables, ignore_index=True)
-                final_tables.append(merged)
-                logger.info(f"Merged {len(group_tables)} tables into {len(merged)} rows")
-
-        # Return the largest merged group (contains most data)
-        if len(final_tables) > 1:
-            largest = max(final_tables, key=len)
-            logger.warning(f"Multiple table structures found. Using largest with {len(largest)} rows")
-            return largest
-
-        return final_tables[0] if final_tables else pd.DataFrame()
+        # Pick the largest group (contains most data) before merging, so only one group is concatenated
+        group_rows = {col_key: sum(len(table) for table in group_tables)
+                      for col_key, group_tables in merged_groups.items()}
+        largest_key = max(group_rows, key=group_rows.get)
+        group_tables = merged_groups[largest_key]
+
+        if len(merged_groups) > 1:
+            logger.warning(f"Multiple table structures found. Using largest with {group_rows[largest_key]} rows")
+
+        if len(group_tables) == 1:
+            logger.debug(f"Single table with {len(group_tables[0])} rows")
+            return group_tables[0]
+
+        # Concatenate all tables with same structure (multi-page data)
+        merged = pd.concat(group_tables, ignore_index=True)
+        logger.info(f"Merged {len(group_tables)} tables into {len(merged)} rows")
+        return merged
     
     def _extract_text_as_dataframe(self, file_path: Path) -> pd.DataFrame:
         """
@@ -382,31 +499,29 @@ class PDFParser(BaseParser):
             
             # Look for tabular data patterns
             data_lines = []
+            max_cols = 0
             for line in lines:
                 # Skip empty lines
-                if not line.strip():
+                line = line.strip()
+                if not line:
                     continue
                 
                 # Check if line contains multiple data points (separated by spaces/tabs)
-                parts = re.split(r'\s{2,}|\t', line.strip())
+                parts = _COLUMN_SEPARATOR_RE.split(line)
                 if len(parts) > 1:
                     data_lines.append(parts)
+                    max_cols = max(max_cols, len(parts))
             
-            if data_lines:
-                # Try to identify header
-                if len(data_lines) > 1:
-                    # Assume first line is header if it has the same number of columns
-                    max_cols = max(len(line) for line in data_lines)
-                    
-                    # Pad lines to have same number of columns
-                    padded_lines = []
-                    for line in data_lines:
-                        padded = line + [''] * (max_cols - len(line))
-                        padded_lines.append(padded)
-                    
-                    # Create DataFrame
-                    df = pd.DataFrame(padded_lines[1:], columns=padded_lines[0])
-                    return self.clean_dataframe(df)
+            # Try to identify header
+            if len(data_lines) > 1:
+                # Pad lines in place to have the same number of columns
+                for parts in data_lines:
+                    if len(parts) < max_cols:
+                        parts.extend([''] * (max_cols - len(parts)))
+                
+                # Assume first line is header
+                df = pd.DataFrame(data_lines[1:], columns=data_lines[0])
+                return self.clean_dataframe(df)
             
             # If no structured data found, return text as single column DataFrame
             return pd.DataFrame({'text': [line.strip() for line in lines if line.strip()]})
@@ -431,16 +546,22 @@ class PDFParser(BaseParser):
         
         text = ""
         
-        # Try PyPDF2 first (faster)
+        # Try PyPDF2 first (faster); it reads from the mapping instead of
+        # copying the whole file into memory
         try:
-            reader = PdfReader(file_path)
-            for page_num, page in enumerate(reader.pages):
-                if len(text) >= max_chars:
-                    break
-                
-                page_text = page.extract_text()
-                if page_text:
-                    text += f"\n--- Page {page_num + 1} ---\n{page_text}"
+            with open_mapped(file_path) as data:
+                reader = PdfReader(data)
+                for page_num, page in enumerate(reader.pages):
+                    if len(text) >= max_chars:
+                        break
+                    
+                    # Scanned pages have no fonts; skip decoding their content
+                    if not self._has_text_resources(page):
+                        continue
+                    
+                    page_text = page.extract_text()
+                    if page_text:
+                        text += f"\n--- Page {page_num + 1} ---\n{page_text}"
             
             if text:
                 return text[:max_chars]
@@ -465,6 +586,63 @@ class PDFParser(BaseParser):
             logger.error(f"Failed to extract text from PDF: {e}")
             return ""
     
+    def _is_image_only(self, file_path: Path, fileobj: Optional[BinaryIO] = None) -> bool:
+        """
+        Check whether no page of a PDF can contain text.
+        
+        Only the page resource dictionaries are read, no content streams.
+        
+        Args:
+            file_path: Path to the PDF file
+            fileobj: Already read file content (read from file_path if None)
+            
+        Returns:
+            True if the PDF has pages and none of them has text resources
+        """
+        try:
+            if fileobj is not None:
+                try:
+                    pages = PdfReader(fileobj).pages
+                    return len(pages) > 0 and not any(self._has_text_resources(page) for page in pages)
+                finally:
+                    fileobj.seek(0)
+            
+            with open_mapped(file_path) as data:
+                pages = PdfReader(data).pages
+                return len(pages) > 0 and not any(self._has_text_resources(page) for page in pages)
+        except Exception as e:
+            logger.debug(f"Could not inspect PDF resources of {file_path}: {e}")
+            return False
+    
+    @staticmethod
+    def _has_text_resources(page) -> bool:
+        """
+        Check whether a PyPDF2 page can contain text.
+        
+        Text needs a font, either in the page resources or in a form
+        XObject; pages with only image XObjects (scans) have none.
+        
+        Args:
+            page: PyPDF2 page object
+            
+        Returns:
+            False if the page has no fonts and no form XObjects, True otherwise
+        """
+        resources = page.get('/Resources')
+        if resources is None:
+            return True
+        
+        resources = resources.get_object()
+        if '/Font' in resources:
+            return True
+        
+        xobjects = resources.get('/XObject')
+        if xobjects is None:
+            return False
+        
+        return any(xobject.get_object().get('/Subtype') == '/Form'
+                   for xobject in xobjects.get_object().values())
+    
     def get_metadata(self, file_path: Path) -> Dict[str, Any]:
         """
         Extract metadata from PDF file.
@@ -481,7 +659,7 @@ class PDFParser(BaseParser):
             reader = PdfReader(file_path)
             
             metadata.update({
-                "page_count": len(reader.pages),
+                "page_count": self._page_count(reader),
                 "pdf_version": reader.pdf_header if hasattr(reader, 'pdf_header') else None,
                 "encrypted": reader.is_encrypted if hasattr(reader, 'is_encrypted') else False
             })
@@ -508,6 +686,25 @@ class PDFParser(BaseParser):
         
         return metadata
     
+    @staticmethod
+    def _page_count(reader: PdfReader) -> int:
+        """
+        Get the page count from the /Count entry of the page tree root.
+        
+        len(reader.pages) flattens the whole page tree; the root node
+        already stores the count.
+        
+        Args:
+            reader: PyPDF2 reader of the document
+            
+        Returns:
+            Number of pages
+        """
+        try:
+            return int(reader.trailer['/Root']['/Pages']['/Count'])
+        except (KeyError, TypeError, ValueError):
+            return len(reader.pages)
+    
     def extract_images_count(self, file_path: Path) -> int:
         """
         Count number of images in PDF.
@@ -0,0 +1,70 @@
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from parsers.base_parser import BaseParser
+
+# Parser class (exported by the parsers package) for each supported file format
+PARSER_CLASSES = {
+    'pdf': 'PDFParser',
+    'xlsx': 'ExcelParser',
+    'xls': 'ExcelParser',
+    'csv': 'CSVParser',
+    'html': 'HTMLParser',
+    'htm': 'HTMLParser'
+}
+
+
+class ParserMap(Mapping):
+    """Mapping of file format to parser instance; parsers are created on first use."""
+    
+    def __init__(self):
+        """Initialize ParserMap."""
+        self._parsers: Dict[str, BaseParser] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, file_format: str) -> BaseParser:
+        parser = self._parsers.get(file_format)
+        
+        if parser is None:
+            class_name = PARSER_CLASSES[file_format]
+            
+            with self._lock:
+                parser = self._parsers.get(file_format)
+                if parser is None:
+                    import parsers
+                    parser = getattr(parsers, class_name)()
+                    self._parsers[file_format] = parser
+        
+        return parser
+    
+    def __contains__(self, file_format: object) -> bool:
+        return file_format in PARSER_CLASSES
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(PARSER_CLASSES)
+    
+    def __len__(self) -> int:
+        return len(PARSER_CLASSES)
+
+
+def prime_parse_cache(file_path: Path, cache_dir: Path, ttl_hours: Optional[float] = None) -> bool:
+    """
+    Parse a file into the parse cache (process pool worker).
+    
+    Args:
+        file_path: Path to the file to parse
+        cache_dir: Parse cache directory of the main process
+        ttl_hours: Parse cache expiry of the main process
+        
+    Returns:
+        True if the file was parsed, False otherwise
+    """
+    BaseParser.enable_cache(cache_dir, ttl_hours)
+    file_format = file_path.suffix[1:].lower()
+    
+    if file_format not in PARSER_CLASSES:
+        return False
+    
+    return ParserMap()[file_format].safe_parse(file_path) is not None
@@ -1,13 +1,16 @@
 from utils.config_loader import ConfigLoader
-from utils.file_handler import FileHandler
+from utils.file_handler import FileHandler, open_mapped
 from utils.logger import setup_logging, AnalysisLogger
+from utils.llm_cache import LLMCache
 from utils.scoring import RiskScorer, ScoreResult, CheckResult, RiskLevel, Status
 
 __all__ = [
     'ConfigLoader',
     'FileHandler',
+    'open_mapped',
     'setup_logging',
     'AnalysisLogger',
+    'LLMCache',
     'RiskScorer',
     'ScoreResult',
     'CheckResult',
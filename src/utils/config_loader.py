@@ -174,6 +174,15 @@ class ConfigLoader:
         if os.getenv("ENABLE_PARALLEL_PROCESSING"):
             config.setdefault("processing", {})["parallel_processing"] = \
                 os.getenv("ENABLE_PARALLEL_PROCESSING").lower() == "true"
+        if os.getenv("MAX_WORKERS"):
+            config.setdefault("processing", {})["max_workers"] = int(os.getenv("MAX_WORKERS"))
+        if os.getenv("PARSE_PROCESSES"):
+            config.setdefault("processing", {})["parse_processes"] = int(os.getenv("PARSE_PROCESSES"))
+        if os.getenv("PDF_PAGE_PROCESSES"):
+            config.setdefault("processing", {})["pdf_page_processes"] = int(os.getenv("PDF_PAGE_PROCESSES"))
+        if os.getenv("BATCH_DETECTION"):
+            config.setdefault("processing", {})["batch_detection"] = \
+                os.getenv("BATCH_DETECTION").lower() == "true"
         
         # Logging settings
         if os.getenv("LOG_LEVEL"):
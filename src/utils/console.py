@@ -0,0 +1,5 @@
+import threading
+
+# Serialises interactive console prompts (manual report type selection,
+# report month input) when files are processed by parallel worker threads.
+PROMPT_LOCK = threading.Lock()
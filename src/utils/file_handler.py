@@ -1,16 +1,87 @@
+import io
 import os
 import json
+import mmap
 import shutil
 import hashlib
 import logging
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import Iterator, List, Optional, Dict, Any, Union
 from datetime import datetime, timedelta
 import chardet
 
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def open_mapped(file_path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    Memory-map a file read-only.
+    
+    Pages are served from the OS page cache, so hashing and parsing the same
+    mapping does not read the file twice.
+    
+    Args:
+        file_path: Path to the file
+        
+    Yields:
+        Read-only mapping of the file content (empty bytes for empty files)
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+class MappedFile(io.RawIOBase):
+    """
+    Read-only, seekable file object over a memory mapping.
+    
+    Reads are served from the mapping without a heap copy of the whole
+    content. A bare mmap cannot be used as file object everywhere: zipfile
+    (and thus the Excel engines) needs seekable(), which mmap only has from
+    Python 3.13 on.
+    """
+    
+    def __init__(self, mapping: Union[mmap.mmap, bytes]):
+        """
+        Initialize MappedFile.
+        
+        Args:
+            mapping: Mapping yielded by open_mapped (bytes for empty files)
+        """
+        super().__init__()
+        self._mapping = mapping if isinstance(mapping, mmap.mmap) else io.BytesIO(mapping)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._mapping.read(-1 if size is None else size)
+    
+    def readall(self) -> bytes:
+        return self._mapping.read(-1)
+    
+    def readinto(self, buffer) -> int:
+        data = self._mapping.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapping.seek(offset, whence)
+        return self._mapping.tell()
+    
+    def tell(self) -> int:
+        return self._mapping.tell()
+
+
 class FileHandler:
     """Handles file operations including scanning, reading, and caching."""
     
@@ -28,6 +99,9 @@ class FileHandler:
         self.cache_enabled = config["processing"].get("cache_parsed_files", True)
         self.cache_dir = Path(config["paths"].get("cache", "./cache"))
         
+        # Stat results of the files found by the last input directory scan
+        self.file_stats: Dict[Path, os.stat_result] = {}
+        
         # Create directories if they don't exist
         self._ensure_directories()
         
@@ -53,16 +127,28 @@ class FileHandler:
             logger.warning(f"Input directory does not exist: {self.input_dir}")
             return []
 
+        # Single directory scan; the stat results are kept for later checks
         files = []
-        for ext in self.supported_formats:
-            pattern = f"*.{ext}"
-            found_files = list(self.input_dir.glob(pattern))
-            files.extend(found_files)
-            if found_files:
-                logger.info(f"Found {len(found_files)} {ext} files")
+        self.file_stats = {}
+        counts = {ext: 0 for ext in self.supported_formats}
+        
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                ext = os.path.normcase(os.path.splitext(entry.name)[1][1:])
+                if ext not in counts or entry.name.startswith('.') or not entry.is_file():
+                    continue
+                
+                file_path = Path(entry.path)
+                self.file_stats[file_path] = entry.stat()
+                files.append(file_path)
+                counts[ext] += 1
+        
+        for ext, count in counts.items():
+            if count:
+                logger.info(f"Found {count} {ext} files")
 
         # Sort files by modification time (newest first)
-        files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        files.sort(key=lambda x: self.file_stats[x].st_mtime, reverse=True)
 
         logger.info(f"Total files found: {len(files)}")
         return files
@@ -387,8 +473,9 @@ class FileHandler:
                     invalid_files.append(file_path)
                     continue
                 
-                # Check file size
-                if file_path.stat().st_size == 0:
+                # Check file size (stat from the directory scan if available)
+                stat = self.file_stats.get(file_path) or file_path.stat()
+                if stat.st_size == 0:
                     logger.warning(f"Empty file: {file_path}")
                     invalid_files.append(file_path)
                     continue
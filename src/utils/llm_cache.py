@@ -0,0 +1,138 @@
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Disk-backed cache for LLM responses keyed by a SHA-256 of the request."""
+    
+    def __init__(self, cache_dir: Path, ttl_hours: Optional[float] = None):
+        """
+        Initialize LLMCache.
+        
+        Args:
+            cache_dir: Directory to store cached responses in
+            ttl_hours: Maximum age of cache entries (None = never expire)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_hours = ttl_hours
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from the request parts.
+        
+        Args:
+            *parts: JSON-serializable request parts (model, prompt, content, ...)
+            
+        Returns:
+            SHA-256 hex digest of the request
+        """
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key from make_key()
+            
+        Returns:
+            Cached response data or None if not found/expired
+        """
+        cache_file = self.cache_dir / f"{key}.json"
+        
+        if not cache_file.exists():
+            return None
+        
+        try:
+            if self.ttl_hours is not None:
+                cache_age_hours = (datetime.now() - datetime.fromtimestamp(
+                    cache_file.stat().st_mtime
+                )).total_seconds() / 3600
+                
+                if cache_age_hours > self.ttl_hours:
+                    cache_file.unlink()
+                    return None
+            
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+                
+        except Exception as e:
+            logger.warning(f"Failed to read LLM cache entry {key}: {e}")
+            return None
+    
+    def set(self, key: str, data: Dict[str, Any]) -> bool:
+        """
+        Store a response in the cache.
+        
+        Args:
+            key: Cache key from make_key()
+            data: Response data to cache
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        cache_file = self.cache_dir / f"{key}.json"
+        tmp_file = self.cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        
+        try:
+            # Write then rename so concurrent readers never see partial entries
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            tmp_file.replace(cache_file)
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Failed to write LLM cache entry {key}: {e}")
+            return False
+    
+    def has_entries(self) -> bool:
+        """
+        Check whether the cache holds any unexpired response.
+        
+        Returns:
+            True if at least one entry can be served
+        """
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                if self.ttl_hours is None:
+                    return True
+                
+                cache_age_hours = (datetime.now() - datetime.fromtimestamp(
+                    cache_file.stat().st_mtime
+                )).total_seconds() / 3600
+                
+                if cache_age_hours <= self.ttl_hours:
+                    return True
+                    
+            except OSError:
+                continue
+        
+        return False
+    
+    def clear(self) -> int:
+        """
+        Remove all cached responses.
+        
+        Returns:
+            Number of entries removed
+        """
+        cleared = 0
+        
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                cache_file.unlink()
+                cleared += 1
+            except Exception as e:
+                logger.warning(f"Failed to clear LLM cache file {cache_file}: {e}")
+        
+        return cleared
@@ -1,5 +1,6 @@
 import logging
 import logging.handlers
+import threading
 import colorlog
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -95,6 +96,8 @@ class AnalysisLogger:
         """
         self.logger = logger
         self.context: Dict[str, Any] = {}
+        # Context is shared between worker threads; log calls update it atomically
+        self._lock = threading.RLock()
     
     def set_context(self, **kwargs) -> None:
         """
@@ -125,30 +128,39 @@ class AnalysisLogger:
         context_str = " | ".join(f"{k}={v}" for k, v in self.context.items())
         return f"{message} | {context_str}"
     
+    def _log(self, level: int, message: str, **kwargs) -> None:
+        """
+        Update the context and log message, formatting it only if level is enabled.
+        
+        Args:
+            level: Logging level
+            message: Base message
+            **kwargs: Context key-value pairs
+        """
+        with self._lock:
+            self.set_context(**kwargs)
+            if self.logger.isEnabledFor(level):
+                self.logger.log(level, self._format_message(message))
+    
     def debug(self, message: str, **kwargs) -> None:
         """Log debug message with context."""
-        self.set_context(**kwargs)
-        self.logger.debug(self._format_message(message))
+        self._log(logging.DEBUG, message, **kwargs)
     
     def info(self, message: str, **kwargs) -> None:
         """Log info message with context."""
-        self.set_context(**kwargs)
-        self.logger.info(self._format_message(message))
+        self._log(logging.INFO, message, **kwargs)
     
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message with context."""
-        self.set_context(**kwargs)
-        self.logger.warning(self._format_message(message))
+        self._log(logging.WARNING, message, **kwargs)
     
     def error(self, message: str, **kwargs) -> None:
         """Log error message with context."""
-        self.set_context(**kwargs)
-        self.logger.error(self._format_message(message))
+        self._log(logging.ERROR, message, **kwargs)
     
     def critical(self, message: str, **kwargs) -> None:
         """Log critical message with context."""
-        self.set_context(**kwargs)
-        self.logger.critical(self._format_message(message))
+        self._log(logging.CRITICAL, message, **kwargs)
     
     def log_analysis_start(self, file_name: str, report_type: str) -> None:
         """
@@ -195,9 +207,10 @@ class AnalysisLogger:
         """
         import traceback
         
-        self.set_context(**kwargs)
-        self.error(f"{message}: {str(exception)}")
-        self.debug(f"Traceback: {traceback.format_exc()}")
+        with self._lock:
+            self.set_context(**kwargs)
+            self.error(f"{message}: {str(exception)}")
+            self.debug(f"Traceback: {traceback.format_exc()}")
     
     def log_performance_metric(self, operation: str, duration_ms: float, 
                               **kwargs) -> None:
@@ -0,0 +1,82 @@
+"""Tests for BaseParser.clean_dataframe and the parse cache."""
+
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from parsers.base_parser import BaseParser  # noqa: E402
+from parsers.csv_parser import CSVParser  # noqa: E402
+
+
+@pytest.mark.parametrize("frame", [
+    # Empty row only
+    pd.DataFrame({"name": [" a ", None, "b "], "count": [1, None, 3]}),
+    # Empty column only
+    pd.DataFrame({"name": [" a ", "c", "b "], "empty": [None, None, None]}),
+    # Empty row and empty column
+    pd.DataFrame({"name": [" a ", None, "b "], "empty": [None, None, None]}),
+    # Nothing empty
+    pd.DataFrame({"name": [" a ", "c", "b "], "count": [1, 2, 3]}),
+])
+def test_clean_dataframe_does_not_warn_or_modify_input(frame):
+    original = frame.copy(deep=True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        cleaned = CSVParser().clean_dataframe(frame)
+
+    pd.testing.assert_frame_equal(frame, original)
+    assert cleaned.notna().any(axis=1).all()
+    assert cleaned.notna().any(axis=0).all()
+    assert cleaned["name"].str.strip().equals(cleaned["name"])
+    assert cleaned.index.equals(pd.RangeIndex(len(cleaned)))
+
+
+@pytest.fixture
+def parse_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(BaseParser, "cache_dir", None)
+    monkeypatch.setattr(BaseParser, "cache_ttl_hours", None)
+    BaseParser.enable_cache(tmp_path / "parsed", ttl_hours=1)
+    csv_file = tmp_path / "report.csv"
+    csv_file.write_text("name;count\na;1\nb;2\n", encoding="utf-8")
+    return csv_file
+
+
+def test_parse_cache_key_contains_cache_version(parse_cache, monkeypatch):
+    parser = CSVParser()
+    parser.safe_parse(parse_cache)
+    cache_path = parser._get_cache_path(parse_cache, "parse.pkl")
+    assert cache_path.exists()
+
+    monkeypatch.setattr(CSVParser, "CACHE_VERSION", CSVParser.CACHE_VERSION + 1)
+    assert parser._get_cache_path(parse_cache, "parse.pkl") != cache_path
+
+
+def test_expired_parse_cache_is_discarded(parse_cache):
+    parser = CSVParser()
+    parser.safe_parse(parse_cache)
+    cache_path = parser._get_cache_path(parse_cache, "parse.pkl")
+    two_hours_ago = time.time() - 2 * 3600
+    os.utime(cache_path, (two_hours_ago, two_hours_ago))
+
+    assert parser._load_cached_parse(cache_path) is None
+    assert not cache_path.exists()
+
+
+def test_safe_parse_reads_excel_from_mapping(tmp_path, monkeypatch):
+    from parsers.excel_parser import ExcelParser
+
+    monkeypatch.setattr(BaseParser, "cache_dir", None)
+    xlsx_file = tmp_path / "report.xlsx"
+    pd.DataFrame({"name": ["a", "b"], "count": [1, 2]}).to_excel(xlsx_file, index=False)
+
+    parsed = ExcelParser().safe_parse(xlsx_file)
+
+    pd.testing.assert_frame_equal(parsed, pd.DataFrame({"name": ["a", "b"], "count": [1, 2]}))